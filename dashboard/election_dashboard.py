@@ -3,12 +3,37 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import networkx as nx
+import matplotlib
 import matplotlib.pyplot as plt
 from collections import Counter
 import re
-import time
-from io import BytesIO
-import base64
+import os
+import sys
+
+# Make the project's src modules importable under `streamlit run`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import load_twitter_data, default_data_path, file_fingerprint, ANALYSIS_COLUMNS
+from src.artifact_store import bundle_path, load_bundle
+from src.graph_store import default_graph_path, open_graph
+from src.graph_builder import build_mention_graph, compute_network_metrics, top_degree_nodes
+from src.components import component_analysis
+from src.bridges import detect_bridges, top_bridges
+from src.influence import (INFLUENCE_FEATURES, influence_table, influence_profile, top_influencers,
+                           sorted_handles, find_users)
+from src.centrality import compute_centralities, top_users
+from src.cascade import simulate_cascade, strategy_seeds
+from src.seed_selection import compare_strategies
+from src.communities import compute_communities, community_sizes, community_edge_weights
+from src.polarization import polarization_metrics
+from src.temporal import polarization_over_time, DEFAULT_WINDOW
+from src.hashtags import build_hashtag_graph, reweight, classify_hashtags, top_cooccurrences
+from src.engagement import engagement_stats
+from src.rollups import build_engagement_cube, peak_hours, NO_CATEGORY
+from src.layout import LayoutService
+from src.figure_cache import FigureCache, figure_png, figure_spec_hash
+from src.render import (MAX_DRAWN_NODES, community_supergraph, draw_graph, draw_communities,
+                        draw_nodes, draw_edges)
 
 # Set page configuration
 st.set_page_config(
@@ -71,15 +96,324 @@ if 'results_loaded' not in st.session_state:
     st.session_state.results_loaded = False
 if 'current_view' not in st.session_state:
     st.session_state.current_view = 'home'
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = None
+
+# Process-wide caches shared by every session; entries are keyed on the
+# dataset fingerprint so editing the data file invalidates them
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 4
+
+# Marked on the time series charts
+ELECTION_DAY = pd.Timestamp('2020-11-03')
+
+def current_data_fingerprint():
+    """Fingerprint of the tweet dataset, or None if it is missing"""
+    file_path = default_data_path()
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    # Only hash the file again when its size or mtime changed
+    version = (file_path, stat.st_size, stat.st_mtime_ns)
+    known = st.session_state.get('data_fingerprint')
+    if known is None or known[0] != version:
+        st.session_state.data_fingerprint = known = (version, file_fingerprint(file_path))
+    return known[1]
+
+# Computed once per rerun and used as the key of every cache below
+data_fingerprint = current_data_fingerprint()
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Loading tweets...")
+def cached_tweets(fingerprint, columns=tuple(ANALYSIS_COLUMNS)):
+    """Tweets projected onto `columns`, loaded once per dataset version"""
+    df = load_twitter_data(default_data_path(), columns=list(columns))
+    # Raising keeps a failed read out of the cache, so the next rerun retries
+    if df is None:
+        raise OSError(f"Could not read the tweet dataset at {default_data_path()}")
+    return df
+
+def from_tweets(compute, *args):
+    """Result of a cached computation over the tweets, or None if they cannot be read"""
+    try:
+        return compute(*args)
+    except OSError as e:
+        st.error(str(e))
+        return None
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Building mention graph...")
+def cached_mention_graph(fingerprint, graph_file=None):
+    """Mention graph of the dataset, built once per dataset version"""
+    # A graph file written by the pipeline is memory-mapped, so worker
+    # processes share its pages instead of each rebuilding the graph.
+    # It is part of the cache key, so a file written later is picked up
+    if graph_file is not None:
+        graph = open_graph(graph_file)
+        if graph is not None:
+            return graph
+    
+    df = cached_tweets(fingerprint)
+    if 'text' not in df.columns or 'user' not in df.columns:
+        return None
+    return build_mention_graph(df)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def cached_network_metrics(fingerprint, _graph):
+    """Network summary metrics, computed once per dataset version"""
+    return compute_network_metrics(_graph)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Computing centralities...")
+def cached_centralities(fingerprint, _graph):
+    """Per-user centrality table, computed once per dataset version"""
+    return compute_centralities(_graph)
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_cascade(fingerprint, _graph, seed_type, infection_prob, max_iterations):
+    """Monte Carlo cascade results per dataset version and simulation settings"""
+    seeds = strategy_seeds(_graph, seed_type)
+    return simulate_cascade(_graph, seeds, infection_prob, max_iterations)
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL_SECONDS, show_spinner="Comparing seed strategies...")
+def cached_strategy_comparison(fingerprint, _graph, infection_prob, max_iterations):
+    """Reach of each seed strategy per dataset version and simulation settings"""
+    return compare_strategies(_graph, infection_prob, max_iterations)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Analysing components...")
+def cached_components(fingerprint, _graph):
+    """Component and k-core structure, computed once per dataset version"""
+    return component_analysis(_graph)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Detecting communities...")
+def cached_communities(fingerprint, _graph):
+    """Community partition, computed once per dataset version"""
+    return compute_communities(_graph)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Finding bridge accounts...")
+def cached_bridges(fingerprint, _graph, _labels):
+    """Per-user bridge table for the partition, computed once per dataset version"""
+    return detect_bridges(_graph, _labels)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Scoring influence...")
+def cached_influence(fingerprint, _graph, _centralities, _bridges):
+    """Per-user composite influence features, computed once per dataset version"""
+    return influence_table(_graph, _centralities, _bridges, cached_tweets(fingerprint))
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def cached_sorted_handles(fingerprint, _influence):
+    """Handles of the influence table sorted for prefix search, once per dataset version"""
+    return sorted_handles(_influence)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def cached_polarization(fingerprint, _graph, _labels):
+    """Polarization metrics of the partition, computed once per dataset version"""
+    return polarization_metrics(_graph, _labels)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Tracking polarization over time...")
+def cached_polarization_over_time(fingerprint):
+    """Sliding-window polarization series, computed once per dataset version"""
+    df = cached_tweets(fingerprint)
+    if not {'text', 'user', 'created_at'}.issubset(df.columns):
+        return None
+    return polarization_over_time(df)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Building hashtag network...")
+def cached_hashtag_graph(fingerprint):
+    """Hashtag co-occurrence graph, built once per dataset version"""
+    df = cached_tweets(fingerprint)
+    if 'text' not in df.columns:
+        return None
+    return build_hashtag_graph(df)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+def cached_hashtag_categories(fingerprint, _hashtag_graph):
+    """Propagated hashtag categories, computed once per dataset version"""
+    return classify_hashtags(_hashtag_graph)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Aggregating engagement...")
+def cached_engagement(fingerprint):
+    """Engagement summary, computed once per dataset version"""
+    return engagement_stats([cached_tweets(fingerprint)])
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Rolling up engagement...")
+def cached_engagement_cube(fingerprint, _graph, _labels, _hashtag_graph, _tag_labels, viral_threshold):
+    """Engagement cube, rolled up once per dataset version"""
+    df = cached_tweets(fingerprint)
+    if 'created_at' not in df.columns:
+        return None
+    return build_engagement_cube([df], _graph, _labels, _hashtag_graph, _tag_labels, viral_threshold)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Loading analysis results...")
+def cached_analysis_bundle(fingerprint):
+    """Precomputed analysis bundle, read from disk once per dataset version"""
+    # Only called once the bundle file exists, so a miss is never cached
+    return load_bundle(fingerprint)
 
-# Helper function to create download links for images
-def get_image_download_link(fig, filename):
-    """Generate a download link for matplotlib figure"""
-    buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=150, bbox_inches='tight')
-    buf.seek(0)
-    b64 = base64.b64encode(buf.read()).decode()
-    return f'<a href="data:image/png;base64,{b64}" download="{filename}">📥 Download Visualization</a>'
+@st.cache_resource
+def layout_service():
+    """Background layout workers and their coordinate cache, shared by every session"""
+    return LayoutService()
+
+@st.cache_resource
+def figure_cache():
+    """PNG bytes of downloaded figures, shared by every session"""
+    return FigureCache()
+
+# Helper function to offer a figure for download
+def figure_download_button(fig, filename, *spec):
+    """
+    Download button for a matplotlib figure. The PNG is only rendered when
+    the button is clicked, and cached under the figure's spec (filename,
+    dataset and the widget values in `spec`).
+    """
+    key = figure_spec_hash(filename, data_fingerprint, *spec)
+    st.download_button(
+        "📥 Download Visualization",
+        data=lambda: figure_cache().get_or_render(key, lambda: figure_png(fig)),
+        file_name=filename,
+        mime="image/png",
+        key=f"download-{filename}",
+        on_click="ignore"
+    )
+
+# Helper function to look up a precomputed artifact from the loaded bundle
+def get_artifact(name):
+    """Return an artifact from the loaded analysis bundle, or None"""
+    if st.session_state.analysis is None:
+        return None
+    return st.session_state.analysis['artifacts'].get(name)
+
+# Helper function to build the mention graph from the tweet dataset
+def load_mention_graph():
+    """Load tweets and build the mention graph (None if the dataset is unavailable)"""
+    graph = get_artifact('graph')
+    if graph is not None:
+        return graph
+    
+    if data_fingerprint is None:
+        return None
+    graph_file = default_graph_path(data_fingerprint)
+    return from_tweets(cached_mention_graph, data_fingerprint,
+                       graph_file if os.path.exists(graph_file) else None)
+
+# Helper function to look up precomputed cascade results
+def get_cascade_artifact(name, infection_prob, max_iterations):
+    """Cascade artifact from the loaded bundle if it was run with these settings, or None"""
+    artifact = get_artifact(name)
+    if (artifact is None or artifact['max_iterations'] != max_iterations
+            or not np.isclose(artifact['probability'], infection_prob)):
+        return None
+    return artifact['results']
+
+# Helper function to get the per-user centrality table
+def load_centralities(graph):
+    """Centralities from the loaded bundle, or computed (and cached) from the graph"""
+    centralities = get_artifact('centralities')
+    if centralities is None and graph is not None:
+        centralities = cached_centralities(data_fingerprint, graph)
+    return centralities
+
+# Helper function to get the component and core structure
+def load_components(graph):
+    """Component analysis from the loaded bundle, or computed (and cached) from the graph"""
+    components = get_artifact('components')
+    if components is None and graph is not None:
+        components = cached_components(data_fingerprint, graph)
+    return components
+
+# Helper function to get the community partition
+def load_communities(graph):
+    """Partition from the loaded bundle, or computed (and cached) from the graph"""
+    communities = get_artifact('communities')
+    if communities is None and graph is not None:
+        communities = cached_communities(data_fingerprint, graph)
+    return communities
+
+# Helper function to get the bridge account table
+def load_bridges(graph):
+    """Bridge table from the loaded bundle, or computed (and cached) from the graph"""
+    bridges = get_artifact('bridges')
+    if bridges is None and graph is not None:
+        communities = load_communities(graph)
+        bridges = cached_bridges(data_fingerprint, graph, communities['labels'])
+    return bridges
+
+# Helper function to get the composite influence table
+def load_influence(graph):
+    """Influence table from the loaded bundle, or computed (and cached) from the graph"""
+    influence = get_artifact('influence')
+    if influence is None and graph is not None:
+        influence = from_tweets(cached_influence, data_fingerprint, graph, load_centralities(graph),
+                                load_bridges(graph))
+    return influence
+
+# Helper function to get the hashtag co-occurrence graph
+def load_hashtag_graph():
+    """Hashtag graph from the loaded bundle, or built (and cached) from the dataset"""
+    hashtag_graph = get_artifact('hashtags')
+    if hashtag_graph is None and data_fingerprint is not None:
+        hashtag_graph = from_tweets(cached_hashtag_graph, data_fingerprint)
+    return hashtag_graph
+
+# Helper function to get the inferred hashtag categories
+def load_hashtag_categories(hashtag_graph):
+    """Hashtag categories from the loaded bundle, or propagated (and cached) from the graph"""
+    hashtag_categories = get_artifact('hashtag_categories')
+    if hashtag_categories is None:
+        hashtag_categories = cached_hashtag_categories(data_fingerprint, hashtag_graph)
+    return hashtag_categories
+
+# Helper function to get the engagement summary
+def load_engagement():
+    """Engagement summary from the loaded bundle, or computed (and cached) from the dataset"""
+    engagement = get_artifact('engagement')
+    if engagement is None and data_fingerprint is not None:
+        engagement = from_tweets(cached_engagement, data_fingerprint)
+    if engagement is not None and engagement['tweets'] == 0:
+        engagement = None
+    return engagement
+
+# Helper function to get the engagement cube
+def load_engagement_cube(engagement):
+    """Engagement cube from the loaded bundle, or rolled up (and cached) from the dataset"""
+    cube = get_artifact('engagement_cube')
+    if cube is not None or engagement is None:
+        return cube
+    
+    graph = load_mention_graph()
+    communities = load_communities(graph)
+    hashtag_graph = load_hashtag_graph()
+    hashtag_categories = load_hashtag_categories(hashtag_graph) if hashtag_graph is not None else None
+    return from_tweets(
+        cached_engagement_cube,
+        data_fingerprint,
+        graph,
+        communities['labels'] if communities is not None else None,
+        hashtag_graph,
+        hashtag_categories['labels'] if hashtag_categories is not None else None,
+        engagement['viral_threshold']
+    )
+
+# Selectbox labels mapped to layout service algorithms
+LAYOUT_ALGORITHMS = {
+    "ForceAtlas2": "forceatlas2",
+    "Circular": "circular",
+    "Random": "random",
+}
+
+# Helper function to lay out a graph through the layout service
+def layout_coords(adjacency, layout_type):
+    """(n, 2) node positions, computed in the background and cached per graph and algorithm"""
+    with st.spinner("Computing layout..."):
+        return layout_service().layout(adjacency, LAYOUT_ALGORITHMS[layout_type], seed=42)
+
+# Selectbox labels mapped to centrality table columns
+CENTRALITY_COLUMNS = {
+    "Degree Centrality": "degree_centrality",
+    "Betweenness": "betweenness",
+    "Closeness": "closeness",
+    "PageRank": "pagerank",
+    "Eigenvector": "eigenvector"
+}
 
 # Title and Introduction
 st.markdown('<h1 class="main-header">🗳️ 2020 US Election Twitter Analysis Dashboard</h1>', unsafe_allow_html=True)
@@ -128,9 +462,16 @@ with st.sidebar:
     st.markdown("### ⚙️ Settings")
     if st.button("🔄 Load Analysis Results", use_container_width=True):
         with st.spinner("Loading analysis results..."):
-            time.sleep(1)
-            st.session_state.results_loaded = True
-            st.success("Results loaded successfully!")
+            bundle = None
+            if data_fingerprint is not None and os.path.exists(bundle_path(data_fingerprint)):
+                bundle = cached_analysis_bundle(data_fingerprint)
+            if bundle is not None:
+                st.session_state.analysis = bundle
+                st.session_state.results_loaded = True
+                st.success("Results loaded successfully!")
+            else:
+                st.warning("No precomputed results for the current dataset. "
+                           "Run `python -m src.pipeline` to build them.")
     
     st.markdown("---")
     st.markdown("#### 📧 Contact")
@@ -228,6 +569,10 @@ if st.session_state.current_view == 'home':
 elif st.session_state.current_view == 'network':
     st.markdown('<h2 class="sub-header">🔗 Network Construction & Analysis</h2>', unsafe_allow_html=True)
     
+    mention_graph = load_mention_graph()
+    if mention_graph is None:
+        st.info("Tweet dataset not found - showing reference figures from the 20,000-tweet sample.")
+    
     tab1, tab2, tab3 = st.tabs(["📐 Network Statistics", "🎨 Visualization", "📋 Methodology"])
     
     with tab1:
@@ -237,14 +582,32 @@ elif st.session_state.current_view == 'network':
             st.markdown("### Network Properties")
             
             # Create metrics
-            metrics_data = {
-                "Total Nodes (Users)": "16,567",
-                "Total Edges (Mentions)": "18,923",
-                "Network Density": "0.000069",
-                "Average Degree": "2.28",
-                "Directed Graph": "Yes",
-                "Connected Components": "2,841"
-            }
+            if mention_graph is not None:
+                network_metrics = get_artifact('network_metrics')
+                if network_metrics is None:
+                    network_metrics = cached_network_metrics(data_fingerprint, mention_graph)
+                metrics_data = {
+                    "Total Nodes (Users)": f"{network_metrics['Total Nodes (Users)']:,}",
+                    "Total Edges (Mentions)": f"{network_metrics['Total Edges (Mentions)']:,}",
+                    "Network Density": f"{network_metrics['Network Density']:.6f}",
+                    "Average Degree": f"{network_metrics['Average Degree']:.2f}",
+                    "Directed Graph": "Yes",
+                    "Connected Components": f"{network_metrics['Connected Components']:,}"
+                }
+                components = load_components(mention_graph)
+                metrics_data["Strongly Connected Components"] = f"{components['n_strong']:,}"
+                metrics_data["Giant Component"] = (f"{len(components['giant_component']):,} users "
+                                                   f"({components['giant_share']:.1%})")
+                metrics_data["Max k-Core"] = f"{components['max_core']:,}"
+            else:
+                metrics_data = {
+                    "Total Nodes (Users)": "16,567",
+                    "Total Edges (Mentions)": "18,923",
+                    "Network Density": "0.000069",
+                    "Average Degree": "2.28",
+                    "Directed Graph": "Yes",
+                    "Connected Components": "2,841"
+                }
             
             for key, value in metrics_data.items():
                 st.metric(key, value)
@@ -257,6 +620,9 @@ elif st.session_state.current_view == 'network':
                 - **Density**: Proportion of possible connections that exist (very sparse)
                 - **Average Degree**: Average number of connections per user
                 - **Directed**: Mentions have direction (who mentions whom)
+                - **Components**: Groups of users linked by mentions in either direction
+                  (weak) or by mention paths both ways (strong)
+                - **k-Core**: Largest group in which every user interacts with at least k others in it
                 """)
         
         with col2:
@@ -278,6 +644,36 @@ elif st.session_state.current_view == 'network':
             
             st.pyplot(fig)
             st.caption("Simplified network visualization")
+        
+        if mention_graph is not None:
+            st.markdown("### Component & Core Structure")
+            components = load_components(mention_graph)
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig, ax = plt.subplots(figsize=(6, 4))
+                for key, label, marker in [('weak_sizes', 'Weak', 'o'), ('strong_sizes', 'Strong', 's')]:
+                    sizes = components[key]
+                    ax.scatter(sizes['size'], sizes['components'], label=label, marker=marker, alpha=0.7)
+                ax.set_xscale('log')
+                ax.set_yscale('log')
+                ax.set_xlabel("Component Size (users)")
+                ax.set_ylabel("Number of Components")
+                ax.set_title("Component Size Distribution")
+                ax.legend()
+                ax.grid(True, alpha=0.3)
+                st.pyplot(fig)
+            
+            with col2:
+                fig, ax = plt.subplots(figsize=(6, 4))
+                core_sizes = components['core_sizes']
+                ax.bar(core_sizes['k'], core_sizes['users'], color='#3498DB', edgecolor='black', linewidth=0.5)
+                ax.set_yscale('log')
+                ax.set_xlabel("k")
+                ax.set_ylabel("Users in k-Core")
+                ax.set_title("k-Core Decomposition")
+                ax.grid(True, alpha=0.3, axis='y')
+                st.pyplot(fig)
     
     with tab2:
         st.markdown("### Network Visualization")
@@ -291,69 +687,92 @@ elif st.session_state.current_view == 'network':
         
         col1, col2 = st.columns([3, 1])
         
+        with col2:
+            st.markdown("### 🎨 Customize")
+            
+            # Customization options; only the layout algorithm changes positions
+            node_size = st.slider("Node Size", 10, 200, 50)
+            edge_alpha = st.slider("Edge Transparency", 0.0, 1.0, 0.3)
+            layout_type = st.selectbox("Layout Algorithm", list(LAYOUT_ALGORITHMS))
+            
+            st.markdown("---")
+            st.markdown("#### 📊 Legend")
+            st.markdown("""
+            - 🔵 **Blue nodes**: Twitter users
+            - 🔗 **Gray edges**: Mention relationships
+            - 📏 **Node size**: Activity level
+            - 🎯 **Color intensity**: Network importance
+            """)
+        
         with col1:
             # Create visualization based on selection
             fig, ax = plt.subplots(figsize=(10, 8))
             
+            edges_drawn = edges_total = 0
             if viz_type == "Full Network":
-                # Create a simulated network visualization
-                G_viz = nx.erdos_renyi_graph(100, 0.05, seed=42)
-                pos = nx.spring_layout(G_viz, k=0.8, seed=42)
-                
-                # Color nodes by degree
-                degrees = dict(G_viz.degree())
-                node_colors = [degrees[n] for n in G_viz.nodes()]
-                
-                nx.draw_networkx_nodes(G_viz, pos, ax=ax, node_size=50,
-                                      node_color=node_colors, cmap=plt.cm.viridis,
-                                      alpha=0.8)
-                nx.draw_networkx_edges(G_viz, pos, ax=ax, edge_color='gray',
-                                      alpha=0.2, width=0.5)
-                
-                ax.set_title("Full Mention Network (Simulated)", fontsize=14)
+                if mention_graph is not None and mention_graph.n_nodes > MAX_DRAWN_NODES:
+                    # Too many users to draw one by one: collapse communities
+                    labels_all = load_communities(mention_graph)['labels']
+                    super_adjacency, sizes, _ = community_supergraph(mention_graph.adjacency, labels_all)
+                    
+                    # Communities are numbered largest first
+                    shown = min(len(sizes), MAX_DRAWN_NODES)
+                    super_adjacency, sizes = super_adjacency[:shown, :shown], sizes[:shown]
+                    pos = layout_coords(super_adjacency, layout_type)
+                    edges_drawn, edges_total = draw_communities(ax, super_adjacency, sizes, pos,
+                                                                node_size=node_size, edge_alpha=edge_alpha)
+                    ax.set_title(f"Full Mention Network ({shown:,} Largest Communities)", fontsize=14)
+                else:
+                    if mention_graph is not None:
+                        adjacency = mention_graph.adjacency
+                        degrees = mention_graph.in_degree() + mention_graph.out_degree()
+                        ax.set_title(f"Full Mention Network ({mention_graph.n_nodes:,} Users)", fontsize=14)
+                    else:
+                        # Create a simulated network visualization
+                        adjacency = nx.to_scipy_sparse_array(nx.erdos_renyi_graph(100, 0.05, seed=42))
+                        degrees = np.diff(adjacency.indptr)
+                        ax.set_title("Full Mention Network (Simulated)", fontsize=14)
+                    pos = layout_coords(adjacency, layout_type)
+                    
+                    # Color nodes by degree
+                    edges_drawn, edges_total = draw_graph(ax, adjacency, pos, node_size=node_size,
+                                                          node_color=degrees, cmap=plt.cm.viridis,
+                                                          edge_alpha=edge_alpha)
                 
             elif viz_type == "Largest Component":
-                # Simulate largest component
-                G_viz = nx.erdos_renyi_graph(50, 0.1, seed=42)
-                pos = nx.spring_layout(G_viz, k=1, seed=42)
+                if mention_graph is not None:
+                    giant = mention_graph.subgraph(load_components(mention_graph)['giant_component'])
+                    adjacency = giant.subgraph(top_degree_nodes(giant, 50)).adjacency
+                else:
+                    # Simulate largest component
+                    adjacency = nx.to_scipy_sparse_array(nx.erdos_renyi_graph(50, 0.1, seed=42))
+                pos = layout_coords(adjacency, layout_type)
                 
-                nx.draw_networkx(G_viz, pos, ax=ax, node_size=100,
-                               node_color='lightgreen', edge_color='gray',
-                               with_labels=False, alpha=0.8)
+                edges_drawn, edges_total = draw_graph(ax, adjacency, pos, node_size=node_size,
+                                                      node_color='lightgreen', edge_alpha=edge_alpha)
                 ax.set_title("Largest Connected Component", fontsize=14)
             
             else:  # Sample Subgraph
-                G_viz = nx.erdos_renyi_graph(30, 0.15, seed=42)
-                pos = nx.spring_layout(G_viz, k=1.2, seed=42)
+                if mention_graph is not None:
+                    sub = mention_graph.subgraph(top_degree_nodes(mention_graph, 30))
+                    adjacency, names = sub.adjacency, sub.handles
+                else:
+                    G_viz = nx.erdos_renyi_graph(30, 0.15, seed=42)
+                    adjacency, names = nx.to_scipy_sparse_array(G_viz), list(G_viz)
+                pos = layout_coords(adjacency, layout_type)
                 
-                nx.draw_networkx(G_viz, pos, ax=ax, node_size=150,
-                               node_color='lightcoral', edge_color='gray',
-                               with_labels=True, font_size=8,
-                               font_weight='bold')
+                edges_drawn, edges_total = draw_graph(ax, adjacency, pos, node_size=node_size,
+                                                      node_color='lightcoral', edge_alpha=edge_alpha,
+                                                      labels=names)
                 ax.set_title("Sample Subgraph with Labels", fontsize=14)
             
             ax.axis('off')
             st.pyplot(fig)
+            if edges_drawn < edges_total:
+                st.caption(f"Showing {edges_drawn:,} of {edges_total:,} connections, sampled by weight")
             
             # Download link
-            st.markdown(get_image_download_link(fig, "network_visualization.png"), unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("### 🎨 Customize")
-            
-            # Customization options
-            node_size = st.slider("Node Size", 10, 200, 50)
-            edge_alpha = st.slider("Edge Transparency", 0.0, 1.0, 0.3)
-            layout_type = st.selectbox("Layout Algorithm", ["Spring", "Circular", "Random"])
-            
-            st.markdown("---")
-            st.markdown("#### 📊 Legend")
-            st.markdown("""
-            - 🔵 **Blue nodes**: Twitter users
-            - 🔗 **Gray edges**: Mention relationships
-            - 📏 **Node size**: Activity level
-            - 🎯 **Color intensity**: Network importance
-            """)
+            figure_download_button(fig, "network_visualization.png", viz_type, layout_type, node_size, edge_alpha)
     
     with tab3:
         st.markdown("### 📋 Methodology Details")
@@ -391,6 +810,10 @@ elif st.session_state.current_view == 'network':
 elif st.session_state.current_view == 'influencers':
     st.markdown('<h2 class="sub-header">🎯 Key Influencer Analysis</h2>', unsafe_allow_html=True)
     
+    centralities = load_centralities(load_mention_graph())
+    influence = load_influence(load_mention_graph())
+    profile_user = None
+    
     col1, col2 = st.columns([2, 1])
     
     with col1:
@@ -402,56 +825,83 @@ elif st.session_state.current_view == 'influencers':
         with tab1:
             st.markdown("#### Top 10 Most Mentioned Users")
             
-            # Create sample data
-            top_mentioned = [
-                ("@realdonaldtrump", 1317, "Republican"),
-                ("@joebiden", 500, "Democrat"),
-                ("@nbcnews", 299, "Media"),
-                ("@nypost", 178, "Media"),
-                ("@icecube", 62, "Celebrity"),
-                ("@foxnews", 58, "Media"),
-                ("@cnn", 45, "Media"),
-                ("@potus", 40, "Institution"),
-                ("@seanhannity", 38, "Republican"),
-                ("@kamalaharris", 35, "Democrat")
-            ]
-            
+            if centralities is not None:
+                top_mentioned = [
+                    (f"@{row.user}", int(row.mentions_received), "Unclassified")
+                    for row in top_users(centralities, 'mentions_received').itertuples()
+                ]
+            else:
+                # Create sample data
+                top_mentioned = [
+                    ("@realdonaldtrump", 1317, "Republican"),
+                    ("@joebiden", 500, "Democrat"),
+                    ("@nbcnews", 299, "Media"),
+                    ("@nypost", 178, "Media"),
+                    ("@icecube", 62, "Celebrity"),
+                    ("@foxnews", 58, "Media"),
+                    ("@cnn", 45, "Media"),
+                    ("@potus", 40, "Institution"),
+                    ("@seanhannity", 38, "Republican"),
+                    ("@kamalaharris", 35, "Democrat")
+                ]
+            
+            max_mentions = max(top_mentioned[0][1], 1) if top_mentioned else 1
             for i, (user, mentions, category) in enumerate(top_mentioned, 1):
-                color = "🔴" if category == "Republican" else "🔵" if category == "Democrat" else "🟣"
+                color = ("🔴" if category == "Republican" else "🔵" if category == "Democrat"
+                         else "⚪" if category == "Unclassified" else "🟣")
                 st.markdown(f"**{i}. {color} {user}** - {mentions:,} mentions")
-                st.progress(min(mentions / 1317, 1.0))
+                st.progress(min(mentions / max_mentions, 1.0))
         
         with tab2:
             st.markdown("#### Top 10 Most Active Mentioners")
             
-            top_active = [
-                ("@user_political123", 45, "Grassroots"),
-                ("@user_activist456", 38, "Activist"),
-                ("@user_news789", 32, "Journalist"),
-                ("@user_commentator", 28, "Commentator"),
-                ("@user_observer101", 25, "Observer"),
-                ("@user_analyst202", 22, "Analyst"),
-                ("@user_researcher", 19, "Researcher"),
-                ("@user_citizen303", 17, "Citizen"),
-                ("@user_blogger404", 15, "Blogger"),
-                ("@user_watcher505", 13, "Watcher")
-            ]
+            if centralities is not None:
+                top_active = [
+                    (f"@{row.user}", int(row.mentions_made), f"Mentions {int(row.out_degree):,} distinct accounts")
+                    for row in top_users(centralities, 'mentions_made').itertuples()
+                ]
+            else:
+                top_active = [
+                    ("@user_political123", 45, "Role: Grassroots"),
+                    ("@user_activist456", 38, "Role: Activist"),
+                    ("@user_news789", 32, "Role: Journalist"),
+                    ("@user_commentator", 28, "Role: Commentator"),
+                    ("@user_observer101", 25, "Role: Observer"),
+                    ("@user_analyst202", 22, "Role: Analyst"),
+                    ("@user_researcher", 19, "Role: Researcher"),
+                    ("@user_citizen303", 17, "Role: Citizen"),
+                    ("@user_blogger404", 15, "Role: Blogger"),
+                    ("@user_watcher505", 13, "Role: Watcher")
+                ]
             
             for i, (user, activity, role) in enumerate(top_active, 1):
                 st.markdown(f"**{i}. {user}** - {activity} mentions made")
-                st.caption(f"Role: {role}")
+                st.caption(role)
         
         with tab3:
             st.markdown("#### Key Bridge Accounts")
             st.info("These users connect different communities and facilitate cross-ideology information flow")
             
-            bridges = [
-                ("@nypost", "Connects media and political spheres"),
-                ("@icecube", "Celebrity bridging entertainment and politics"),
-                ("@user_moderate", "Independent commentator engaging both sides"),
-                ("@academic_research", "Researcher sharing data across groups"),
-                ("@local_journalist", "Local news connecting national and local")
-            ]
+            bridge_table = load_bridges(load_mention_graph())
+            if bridge_table is not None and bridge_table['bridge_score'].max() > 0:
+                def community_name(c):
+                    return f"Community {chr(ord('A') + c)}" if c < 26 else f"Community {c + 1}"
+                
+                bridges = [
+                    (f"@{row.user}",
+                     f"Links {community_name(row.community)} and {community_name(row.partner_community)} - "
+                     f"{row.cross_share:.0%} of {row.strength:,.0f} interactions cross communities "
+                     f"(participation {row.participation:.2f})")
+                    for row in top_bridges(bridge_table).itertuples()
+                ]
+            else:
+                bridges = [
+                    ("@nypost", "Connects media and political spheres"),
+                    ("@icecube", "Celebrity bridging entertainment and politics"),
+                    ("@user_moderate", "Independent commentator engaging both sides"),
+                    ("@academic_research", "Researcher sharing data across groups"),
+                    ("@local_journalist", "Local news connecting national and local")
+                ]
             
             for user, description in bridges:
                 st.markdown(f"**{user}**")
@@ -463,8 +913,28 @@ elif st.session_state.current_view == 'influencers':
             st.markdown("Combining mentions received, activity level, and network position")
             
             # Create radar chart
-            categories = ['Mentions\nReceived', 'Activity\nLevel', 'Network\nPosition', 'Community\nBridge', 'Content\nEngagement']
-            values = [4.8, 3.2, 4.5, 3.8, 4.2]
+            categories = [label.replace(' ', '\n') for label in INFLUENCE_FEATURES.values()]
+            if influence is not None and len(influence):
+                # Any user can be looked up by handle, or by its first letters
+                query = st.text_input("Find user:", placeholder="handle").strip().lstrip('@').lower()
+                if query:
+                    candidates = find_users(influence, cached_sorted_handles(data_fingerprint, influence), query)
+                else:
+                    candidates = top_influencers(influence, 50).index.tolist()
+                if not candidates:
+                    st.warning(f"No user matches '{query}'.")
+                    candidates = top_influencers(influence, 50).index.tolist()
+                profile_user = st.selectbox("User:", candidates, format_func=lambda u: f"@{u}")
+                
+                # Percentiles on the 0-5 scale of the chart
+                values = (5 * influence_profile(influence, profile_user)).round(2).tolist()
+                row = influence.loc[profile_user]
+                st.metric("Composite Score", f"{row['influence_score']:.1f} / 100",
+                          f"Rank #{int(row['influence_rank']):,} of {len(influence):,}", delta_color="off")
+                profile_title = f"Influence Profile: @{profile_user}"
+            else:
+                values = [4.8, 3.2, 4.5, 3.8, 4.2]
+                profile_title = "Influence Profile: @nypost"
             
             fig, ax = plt.subplots(figsize=(8, 6), subplot_kw=dict(projection='polar'))
             
@@ -477,9 +947,11 @@ elif st.session_state.current_view == 'influencers':
             ax.set_xticks(angles[:-1])
             ax.set_xticklabels(categories)
             ax.set_ylim(0, 5)
-            ax.set_title("Influence Profile: @nypost", fontsize=14)
+            ax.set_title(profile_title, fontsize=14)
             
             st.pyplot(fig)
+            if influence is not None and len(influence):
+                st.caption("Each axis is the user's percentile among all users (5 = top)")
     
     with col2:
         st.markdown("### 📊 Influence Metrics")
@@ -513,6 +985,34 @@ elif st.session_state.current_view == 'influencers':
             - **Low**: Isolated from network
             - **Interpretation**: Rapid dissemination
             """)
+        elif metric == "PageRank":
+            st.markdown("""
+            Measures recursive importance:
+            - **High**: Mentioned by users who are themselves mentioned
+            - **Low**: Mentioned rarely or only by peripheral users
+            - **Interpretation**: Prestige in the conversation
+            """)
+        elif metric == "Eigenvector":
+            st.markdown("""
+            Measures connection to well-connected users:
+            - **High**: Embedded in the dense core of the network
+            - **Low**: Connected only to the periphery
+            - **Interpretation**: Structural centrality
+            """)
+        
+        if centralities is not None:
+            column = CENTRALITY_COLUMNS[metric]
+            top_by_metric = top_users(centralities, column, 5)
+            st.markdown(f"#### Top 5 by {metric}")
+            top_table = pd.DataFrame({
+                "User": "@" + top_by_metric['user'].astype(str),
+                metric: top_by_metric[column].round(6)
+            }).reset_index(drop=True)
+            if metric == "Betweenness":
+                top_table["± Std. Error"] = top_by_metric['betweenness_stderr'].round(6).to_numpy()
+            st.dataframe(top_table, use_container_width=True)
+            if metric in ("Betweenness", "Closeness"):
+                st.caption("Estimated from a sample of source users rather than all-pairs shortest paths.")
         
         st.markdown("---")
         st.markdown("### 💡 Key Insight")
@@ -524,12 +1024,25 @@ elif st.session_state.current_view == 'influencers':
         
         # Quick comparison
         st.markdown("#### 🏆 Influence Comparison")
-        comparison_data = pd.DataFrame({
-            "User": ["@realdonaldtrump", "@joebiden", "@user_activist456"],
-            "Mentions Received": [1317, 500, 12],
-            "Mentions Made": [0, 0, 38],
-            "Influence Score": [85, 72, 68]
-        })
+        if influence is not None and len(influence):
+            # Top influencers plus the user selected in the profile tab
+            users = top_influencers(influence, 3).index.tolist()
+            if profile_user is not None and profile_user not in users:
+                users.append(profile_user)
+            rows = influence.loc[users]
+            comparison_data = pd.DataFrame({
+                "User": ["@" + str(u) for u in users],
+                "Mentions Received": rows['mentions_received'].round().astype(int).to_numpy(),
+                "Mentions Made": rows['mentions_made'].round().astype(int).to_numpy(),
+                "Influence Score": rows['influence_score'].round(1).to_numpy()
+            })
+        else:
+            comparison_data = pd.DataFrame({
+                "User": ["@realdonaldtrump", "@joebiden", "@user_activist456"],
+                "Mentions Received": [1317, 500, 12],
+                "Mentions Made": [0, 0, 38],
+                "Influence Score": [85, 72, 68]
+            })
         
         st.dataframe(comparison_data, use_container_width=True)
 
@@ -537,6 +1050,15 @@ elif st.session_state.current_view == 'influencers':
 elif st.session_state.current_view == 'echo':
     st.markdown('<h2 class="sub-header">🏛️ Echo Chamber Detection</h2>', unsafe_allow_html=True)
     
+    mention_graph = load_mention_graph()
+    communities = load_communities(mention_graph)
+    if communities is not None:
+        sizes_all = community_sizes(communities['labels'])
+        
+        # The five largest communities are drawn individually
+        n_shown = min(5, len(sizes_all))
+        community_names = [f"Community {chr(ord('A') + i)}" for i in range(n_shown)]
+    
     tab1, tab2, tab3 = st.tabs(["🔍 Community Analysis", "🎨 Visualization", "📈 Polarization Metrics"])
     
     with tab1:
@@ -546,10 +1068,16 @@ elif st.session_state.current_view == 'echo':
             st.markdown("### Political Community Structure")
             
             # Community statistics
-            st.metric("Total Communities", "513")
-            st.metric("Modularity Score", "0.42")
-            st.metric("Largest Community", "2,115 users")
-            st.metric("Average Community Size", "32 users")
+            if communities is not None:
+                st.metric("Total Communities", f"{len(sizes_all):,}")
+                st.metric("Modularity Score", f"{communities['modularity']:.2f}")
+                st.metric("Largest Community", f"{sizes_all[0]:,} users")
+                st.metric("Average Community Size", f"{sizes_all.mean():,.0f} users")
+            else:
+                st.metric("Total Communities", "513")
+                st.metric("Modularity Score", "0.42")
+                st.metric("Largest Community", "2,115 users")
+                st.metric("Average Community Size", "32 users")
             
             st.markdown("---")
             st.markdown("#### 🎯 Key Findings")
@@ -570,11 +1098,20 @@ elif st.session_state.current_view == 'echo':
             # Create pie chart
             fig, ax = plt.subplots(figsize=(6, 6))
             
-            sizes = [2115, 893, 642, 387, 1530]  # Example sizes
-            labels = ['Community A\n(Pro-Trump)', 'Community B\n(Pro-Biden)', 
-                     'Community C\n(Media)', 'Community D\n(Neutral)', 'Others']
+            if communities is not None:
+                n_pie = min(4, len(sizes_all))
+                sizes = sizes_all[:n_pie].tolist() + [int(sizes_all[n_pie:].sum())]
+                labels = community_names[:n_pie] + ['Others']
+            else:
+                sizes = [2115, 893, 642, 387, 1530]  # Example sizes
+                labels = ['Community A\n(Pro-Trump)', 'Community B\n(Pro-Biden)', 
+                         'Community C\n(Media)', 'Community D\n(Neutral)', 'Others']
             colors = ['#E74C3C', '#3498DB', '#9B59B6', '#2ECC71', '#BDC3C7']
             
+            # Drop empty slices (e.g. no 'Others' when there are few communities)
+            slices = [(size, label, color) for size, label, color in zip(sizes, labels, colors) if size > 0]
+            sizes, labels, colors = [list(column) for column in zip(*slices)]
+            
             ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%',
                   startangle=90, textprops={'fontsize': 9})
             ax.axis('equal')
@@ -586,10 +1123,11 @@ elif st.session_state.current_view == 'echo':
         st.markdown("### Community Network Visualization")
         
         # Create interactive visualization
-        community_focus = st.selectbox(
-            "Focus on Community:",
-            ["All Communities", "Pro-Trump Cluster", "Pro-Biden Cluster", "Media Bridge", "Neutral Observers"]
-        )
+        if communities is not None:
+            focus_options = ["All Communities"] + community_names
+        else:
+            focus_options = ["All Communities", "Pro-Trump Cluster", "Pro-Biden Cluster", "Media Bridge", "Neutral Observers"]
+        community_focus = st.selectbox("Focus on Community:", focus_options)
         
         # Create network visualization
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -610,11 +1148,40 @@ elif st.session_state.current_view == 'echo':
         
         # Draw communities
         community_colors = ['#E74C3C', '#3498DB', '#9B59B6', '#2ECC71', '#F39C12']
-        community_labels = ['Trump', 'Biden', 'Media', 'Neutral', 'Issues']
         
+        if communities is not None:
+            # Label each community with its most mentioned member
+            labels_all = communities['labels']
+            in_weight = np.asarray(mention_graph.adjacency.sum(axis=0)).ravel()
+            community_labels = []
+            for i in range(n_shown):
+                members = np.flatnonzero(labels_all == i)
+                top_member = mention_graph.handles[members[in_weight[members].argmax()]]
+                community_labels.append(f"{community_names[i]}\n@{top_member}")
+            member_counts = [min(int(size), 15) for size in sizes_all[:n_shown]]
+            radii = [0.4 + 0.5 * np.sqrt(size / sizes_all[0]) for size in sizes_all[:n_shown]]
+            
+            # Connect communities in proportion to the mentions between them
+            between = community_edge_weights(mention_graph, labels_all, n_shown)
+            between = between + between.T
+            max_between = between.max() if between.max() > 0 else 1
+            bridge_pairs = [(i, j, between[i, j] / max_between)
+                            for i in range(n_shown) for j in range(i + 1, n_shown) if between[i, j] > 0]
+            focus_index = focus_options.index(community_focus) - 1
+        else:
+            community_labels = ['Trump', 'Biden', 'Media', 'Neutral', 'Issues']
+            member_counts = [np.random.randint(5, 15) for _ in community_labels]
+            radii = [0.8] * len(community_labels)
+            bridge_pairs = [(0, 2, 1.0), (1, 2, 1.0), (0, 4, 1.0), (1, 4, 1.0), (2, 3, 1.0)]
+            focus_index = -1
+        
+        member_xy, member_colors = [], []
         for i, (pos, color, label) in enumerate(zip(community_positions, community_colors, community_labels)):
+            # Fade the other communities when one is in focus
+            faded = focus_index >= 0 and i != focus_index
+            
             # Draw community circle
-            circle = plt.Circle(pos, 0.8, color=color, alpha=0.3)
+            circle = plt.Circle(pos, radii[i], color=color, alpha=0.1 if faded else 0.3)
             ax.add_patch(circle)
             
             # Add label
@@ -622,19 +1189,20 @@ elif st.session_state.current_view == 'echo':
                    fontsize=11, fontweight='bold', color=color)
             
             # Add some nodes inside community
-            n_nodes = np.random.randint(5, 15)
-            for j in range(n_nodes):
-                node_x = pos[0] + np.random.uniform(-0.6, 0.6)
-                node_y = pos[1] + np.random.uniform(-0.6, 0.6)
-                ax.plot(node_x, node_y, 'o', color=color, markersize=8, alpha=0.7)
+            spread = 0.75 * radii[i]
+            member_xy.append(np.asarray(pos) + np.random.uniform(-spread, spread, size=(member_counts[i], 2)))
+            member_colors += [matplotlib.colors.to_rgba(color, 0.2 if faded else 0.7)] * member_counts[i]
         
-        # Add cross-community connections (bridges)
-        bridge_pairs = [(0, 2), (1, 2), (0, 4), (1, 4), (2, 3)]
+        # All member nodes in one batch
+        draw_nodes(ax, np.vstack(member_xy), sizes=64, colors=member_colors, alpha=None)
         
-        for i, j in bridge_pairs:
-            x1, y1 = community_positions[i]
-            x2, y2 = community_positions[j]
-            ax.plot([x1, x2], [y1, y2], 'k-', alpha=0.3, linewidth=1)
+        # Add cross-community connections (bridges)
+        if bridge_pairs:
+            bridge_src = np.array([i for i, _, _ in bridge_pairs])
+            bridge_dst = np.array([j for _, j, _ in bridge_pairs])
+            bridge_width = np.array([1 + 4 * strength for _, _, strength in bridge_pairs])
+            draw_edges(ax, np.asarray(community_positions), bridge_src, bridge_dst,
+                       widths=bridge_width, colors='k', alpha=0.3)
         
         ax.set_xlim(-3, 3)
         ax.set_ylim(-3, 3)
@@ -645,7 +1213,7 @@ elif st.session_state.current_view == 'echo':
         st.pyplot(fig)
         
         # Download button
-        st.markdown(get_image_download_link(fig, "echo_chamber_network.png"), unsafe_allow_html=True)
+        figure_download_button(fig, "echo_chamber_network.png", community_focus)
     
     with tab3:
         st.markdown("### Polarization Metrics")
@@ -655,13 +1223,26 @@ elif st.session_state.current_view == 'echo':
         with col1:
             st.markdown("#### 🧮 Quantifying Polarization")
             
-            metrics = {
-                "Modularity": 0.42,
-                "Assortativity": 0.38,
-                "Cross-Community Edges": "12.3%",
-                "Echo Chamber Index": 0.71,
-                "Information Isolation": "85%"
-            }
+            if communities is not None:
+                polarization = get_artifact('polarization')
+                if polarization is None:
+                    polarization = cached_polarization(data_fingerprint, mention_graph,
+                                                       communities['labels'])
+                metrics = {
+                    "Modularity": round(polarization['modularity'], 2),
+                    "Assortativity": round(polarization['assortativity'], 2),
+                    "Cross-Community Edges": f"{polarization['cross_community_share']:.1%}",
+                    "Echo Chamber Index": round(polarization['echo_chamber_index'], 2),
+                    "Information Isolation": f"{polarization['information_isolation']:.0%}"
+                }
+            else:
+                metrics = {
+                    "Modularity": 0.42,
+                    "Assortativity": 0.38,
+                    "Cross-Community Edges": "12.3%",
+                    "Echo Chamber Index": 0.71,
+                    "Information Isolation": "85%"
+                }
             
             for metric, value in metrics.items():
                 st.metric(metric, value)
@@ -672,33 +1253,60 @@ elif st.session_state.current_view == 'echo':
             - **Modularity > 0.3**: Strong community structure
             - **Assortativity > 0.3**: Homophily (similar users connect)
             - **Cross-Community < 15%**: Limited cross-ideology discussion
+            - **Echo Chamber Index**: Negative E-I index, 1 means no mention leaves its community
+            - **Information Isolation**: Users who never mention or get mentioned across communities
             """)
         
         with col2:
             st.markdown("#### 📈 Polarization Over Time")
             
+            over_time = get_artifact('polarization_over_time')
+            if over_time is None and data_fingerprint is not None:
+                over_time = from_tweets(cached_polarization_over_time, data_fingerprint)
+            
             # Create time series
             fig, ax = plt.subplots(figsize=(8, 4))
             
-            days = np.arange(30)
-            polarization = 0.3 + 0.5 * np.sin(days/10) + 0.2 * np.random.randn(30)
-            
-            ax.plot(days, polarization, 'r-', linewidth=2)
-            ax.fill_between(days, polarization, 0.3, alpha=0.3, color='red')
-            
-            ax.set_xlabel("Days Before Election", fontsize=10)
-            ax.set_ylabel("Polarization Index", fontsize=10)
-            ax.set_title("Increasing Polarization Before Election", fontsize=12)
+            if over_time is not None and len(over_time):
+                window_end = over_time['window_end']
+                polarization = over_time['modularity']
+                
+                ax.plot(window_end, polarization, 'r-', linewidth=2)
+                ax.fill_between(window_end, polarization, polarization.min(), alpha=0.3, color='red')
+                ax.axvline(ELECTION_DAY, color='gray', linestyle='--', linewidth=1)
+                
+                ax.set_xlabel(f"End of {DEFAULT_WINDOW}-Day Window", fontsize=10)
+                ax.set_ylabel("Polarization Index (Modularity)", fontsize=10)
+                ax.set_title("Polarization Over Time (dashed line: Election Day)", fontsize=12)
+                fig.autofmt_xdate()
+            else:
+                days = np.arange(30)
+                polarization = 0.3 + 0.5 * np.sin(days/10) + 0.2 * np.random.randn(30)
+                
+                ax.plot(days, polarization, 'r-', linewidth=2)
+                ax.fill_between(days, polarization, 0.3, alpha=0.3, color='red')
+                
+                ax.set_xlabel("Days Before Election", fontsize=10)
+                ax.set_ylabel("Polarization Index", fontsize=10)
+                ax.set_title("Increasing Polarization Before Election", fontsize=12)
             ax.grid(True, alpha=0.3)
             
             st.pyplot(fig)
             
             st.markdown("---")
             st.markdown("#### 💡 Key Insight")
-            st.warning("""
-            **Polarization peaks** in the final week before election,  
-            then gradually decreases as reality sets in.
-            """)
+            if over_time is not None and len(over_time):
+                peak = over_time.loc[over_time['modularity'].idxmax()]
+                st.warning(f"""
+                **Polarization peaks** in the window {peak['window_start']:%b %d} - {peak['window_end'] - pd.Timedelta(days=1):%b %d}
+                (modularity {peak['modularity']:.2f}, {peak['communities']} communities,
+                {peak['cross_community_share']:.1%} of mentions crossing communities).
+                """)
+            else:
+                st.warning("""
+                **Polarization peaks** in the final week before election,  
+                then gradually decreases as reality sets in.
+                """)
 
 # ===== RUMOR SPREAD PAGE =====
 elif st.session_state.current_view == 'rumor':
@@ -721,10 +1329,25 @@ elif st.session_state.current_view == 'rumor':
     with col3:
         max_iterations = st.slider("Maximum Iterations", 5, 20, 10)
     
+    mention_graph = load_mention_graph()
+    
     # Run simulation button
     if st.button("🚀 Run Simulation", type="primary", use_container_width=True):
         with st.spinner("Simulating rumor spread..."):
-            time.sleep(2)
+            precomputed = get_cascade_artifact('cascades', infection_prob, max_iterations)
+            if precomputed is not None and seed_type in precomputed:
+                results_data = precomputed[seed_type]
+            elif mention_graph is not None:
+                results_data = cached_cascade(data_fingerprint, mention_graph,
+                                              seed_type, infection_prob, max_iterations)
+            else:
+                # Reference results from the 20,000-tweet sample
+                results_data = pd.DataFrame({
+                    "Iteration": list(range(1, 11)),
+                    "New Infections": [1, 3, 8, 15, 25, 42, 68, 105, 158, 230],
+                    "Total Infected": [1, 4, 12, 27, 52, 94, 162, 267, 425, 655],
+                    "Network %": [0.01, 0.02, 0.07, 0.16, 0.31, 0.57, 0.98, 1.61, 2.56, 3.95]
+                })
             
             # Create simulation results
             col1, col2 = st.columns(2)
@@ -732,15 +1355,9 @@ elif st.session_state.current_view == 'rumor':
             with col1:
                 st.markdown("#### 📊 Simulation Results")
                 
-                # Create results table
-                results_data = {
-                    "Iteration": list(range(1, 11)),
-                    "New Infections": [1, 3, 8, 15, 25, 42, 68, 105, 158, 230],
-                    "Total Infected": [1, 4, 12, 27, 52, 94, 162, 267, 425, 655],
-                    "Network %": [0.01, 0.02, 0.07, 0.16, 0.31, 0.57, 0.98, 1.61, 2.56, 3.95]
-                }
-                
-                st.dataframe(pd.DataFrame(results_data), use_container_width=True)
+                st.dataframe(results_data.round(2), use_container_width=True)
+                if mention_graph is not None:
+                    st.caption("Mean of 1,000 Monte Carlo trials with 95% confidence band")
             
             with col2:
                 st.markdown("#### 📈 Spread Visualization")
@@ -748,11 +1365,15 @@ elif st.session_state.current_view == 'rumor':
                 # Create line chart
                 fig, ax = plt.subplots(figsize=(8, 4))
                 
-                iterations = results_data["Iteration"]
-                total_infected = results_data["Total Infected"]
+                iterations = results_data["Iteration"].tolist()
+                total_infected = results_data["Total Infected"].tolist()
                 
                 ax.plot(iterations, total_infected, 'b-o', linewidth=2, markersize=6)
-                ax.fill_between(iterations, total_infected, alpha=0.2, color='blue')
+                if "CI Low" in results_data.columns:
+                    ax.fill_between(iterations, results_data["CI Low"], results_data["CI High"],
+                                    alpha=0.2, color='blue', label='95% CI')
+                else:
+                    ax.fill_between(iterations, total_infected, alpha=0.2, color='blue')
                 
                 ax.set_xlabel("Iteration", fontsize=10)
                 ax.set_ylabel("Total Users Reached", fontsize=10)
@@ -760,7 +1381,7 @@ elif st.session_state.current_view == 'rumor':
                 ax.grid(True, alpha=0.3)
                 
                 # Add annotations
-                ax.annotate(f"Final: {total_infected[-1]:,} users",
+                ax.annotate(f"Final: {total_infected[-1]:,.0f} users",
                            xy=(iterations[-1], total_infected[-1]),
                            xytext=(iterations[-1]-2, total_infected[-1]*0.8),
                            arrowprops=dict(arrowstyle='->', color='red'))
@@ -772,18 +1393,28 @@ elif st.session_state.current_view == 'rumor':
     # Comparison of different strategies
     st.markdown("### 📊 Strategy Comparison")
     
-    strategies = ["Conservative Seed", "Liberal Seed", "Media Seed", "Multiple Seeds"]
-    final_reach = [245, 198, 312, 655]
-    colors = ['#E74C3C', '#3498DB', '#9B59B6', '#2ECC71']
+    if mention_graph is not None:
+        comparison = get_cascade_artifact('strategy_comparison', infection_prob, max_iterations)
+        if comparison is None:
+            comparison = cached_strategy_comparison(data_fingerprint, mention_graph,
+                                                    infection_prob, max_iterations)
+        strategies = comparison["Strategy"].tolist()
+        final_reach = comparison["Users Reached"].round().astype(int).tolist()
+        total_users = mention_graph.n_nodes
+    else:
+        strategies = ["Conservative Seed", "Liberal Seed", "Media Seed", "Multiple Seeds"]
+        final_reach = [245, 198, 312, 655]
+        total_users = 16567
+    colors = ['#E74C3C', '#3498DB', '#9B59B6', '#2ECC71', '#F39C12']
     
     fig, ax = plt.subplots(figsize=(10, 5))
     
-    bars = ax.bar(strategies, final_reach, color=colors, edgecolor='black', linewidth=1)
+    bars = ax.bar(strategies, final_reach, color=colors[:len(strategies)], edgecolor='black', linewidth=1)
     
     # Add value labels
     for bar, reach in zip(bars, final_reach):
         height = bar.get_height()
-        percentage = (reach / 16567) * 100
+        percentage = (reach / total_users) * 100
         ax.text(bar.get_x() + bar.get_width()/2., height,
                 f'{reach:,}\n({percentage:.1f}%)', 
                 ha='center', va='bottom', fontsize=9)
@@ -794,6 +1425,11 @@ elif st.session_state.current_view == 'rumor':
     
     st.pyplot(fig)
     
+    if mention_graph is not None:
+        with st.expander("🌱 Seeds used by each strategy"):
+            st.dataframe(comparison, use_container_width=True)
+        st.caption("Optimal (RIS): seeds chosen by reverse influence sampling to maximise expected reach")
+    
     # Key insights
     st.markdown("---")
     st.markdown("### 💡 Key Insights")
@@ -822,35 +1458,65 @@ elif st.session_state.current_view == 'hashtag':
     
     st.markdown("### Political Discourse Through Hashtags")
     
+    hashtag_graph = load_hashtag_graph()
+    if hashtag_graph is not None and hashtag_graph.n_tags == 0:
+        hashtag_graph = None
+    if hashtag_graph is not None:
+        hashtag_categories = load_hashtag_categories(hashtag_graph)
+        tag_categories = hashtag_categories['labels']
+    
     # Top hashtags display
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.markdown("#### Top 15 Hashtags")
         
-        # Create sample hashtag data
-        hashtags = [
-            ("#trump", 1242, "Republican"),
-            ("#biden", 893, "Democrat"),
-            ("#election2020", 642, "Process"),
-            ("#maga", 587, "Republican"),
-            ("#vote", 523, "Process"),
-            ("#bidenharris2020", 478, "Democrat"),
-            ("#trump2020", 432, "Republican"),
-            ("#useelection2020", 387, "Process"),
-            ("#democrat", 345, "Democrat"),
-            ("#republican", 298, "Republican"),
-            ("#foxnews", 265, "Media"),
-            ("#cnn", 234, "Media"),
-            ("#covid", 198, "Issue"),
-            ("#economy", 176, "Issue"),
-            ("#blacklivesmatter", 154, "Issue")
-        ]
+        if hashtag_graph is not None:
+            top = hashtag_graph.top_tags(15)
+            hashtags = [("#" + hashtag_graph.tags[i], int(hashtag_graph.counts[i]), tag_categories[i])
+                        for i in top]
+        else:
+            # Create sample hashtag data
+            hashtags = [
+                ("#trump", 1242, "Republican"),
+                ("#biden", 893, "Democrat"),
+                ("#election2020", 642, "Process"),
+                ("#maga", 587, "Republican"),
+                ("#vote", 523, "Process"),
+                ("#bidenharris2020", 478, "Democrat"),
+                ("#trump2020", 432, "Republican"),
+                ("#useelection2020", 387, "Process"),
+                ("#democrat", 345, "Democrat"),
+                ("#republican", 298, "Republican"),
+                ("#foxnews", 265, "Media"),
+                ("#cnn", 234, "Media"),
+                ("#covid", 198, "Issues"),
+                ("#economy", 176, "Issues"),
+                ("#blacklivesmatter", 154, "Issues")
+            ]
         
+        max_count = max(count for _, count, _ in hashtags)
         for tag, count, category in hashtags:
             emoji = "🔴" if category == "Republican" else "🔵" if category == "Democrat" else "🟡"
             st.markdown(f"{emoji} **{tag}** - {count:,} uses")
-            st.progress(min(count / 1242, 1.0))
+            st.progress(min(count / max_count, 1.0))
+    
+    category_colors = {
+        'Republican': '#E74C3C',
+        'Democrat': '#3498DB',
+        'Process': '#F39C12',
+        'Media': '#9B59B6',
+        'Issues': '#2ECC71',
+        'Unclassified': '#95A5A6'
+    }
+    category_labels = {
+        'Republican': 'Republican',
+        'Democrat': 'Democrat',
+        'Process': 'Election Process',
+        'Media': 'Media',
+        'Issues': 'Issues',
+        'Unclassified': 'Unclassified'
+    }
     
     with col2:
         st.markdown("#### Hashtag Categories")
@@ -858,9 +1524,16 @@ elif st.session_state.current_view == 'hashtag':
         # Pie chart of categories
         fig, ax = plt.subplots(figsize=(6, 6))
         
-        categories = ['Republican', 'Democrat', 'Election Process', 'Media', 'Issues']
-        counts = [2557, 1716, 1552, 499, 528]
-        colors = ['#E74C3C', '#3498DB', '#F39C12', '#9B59B6', '#2ECC71']
+        if hashtag_graph is not None:
+            usage = pd.Series(hashtag_graph.counts).groupby(tag_categories).sum()
+            usage = usage.reindex([c for c in category_colors if usage.get(c, 0) > 0])
+            categories = [category_labels[c] for c in usage.index]
+            counts = usage.to_list()
+            colors = [category_colors[c] for c in usage.index]
+        else:
+            categories = ['Republican', 'Democrat', 'Election Process', 'Media', 'Issues']
+            counts = [2557, 1716, 1552, 499, 528]
+            colors = ['#E74C3C', '#3498DB', '#F39C12', '#9B59B6', '#2ECC71']
         
         ax.pie(counts, labels=categories, colors=colors, autopct='%1.1f%%',
               startangle=90, textprops={'fontsize': 9})
@@ -868,6 +1541,12 @@ elif st.session_state.current_view == 'hashtag':
         ax.set_title("Hashtag Usage by Category", fontsize=12)
         
         st.pyplot(fig)
+        
+        if hashtag_graph is not None:
+            n_seeds = int(hashtag_categories['seed'].sum())
+            n_labelled = int((tag_categories != 'Unclassified').sum())
+            st.caption(f"{n_labelled:,} of {hashtag_graph.n_tags:,} hashtags labelled by propagating "
+                       f"{n_seeds} hand-labelled seed hashtags over the co-occurrence network")
     
     st.markdown("---")
     
@@ -875,15 +1554,66 @@ elif st.session_state.current_view == 'hashtag':
     st.markdown("### Hashtag Co-occurrence Network")
     
     # Create interactive network
-    focus_category = st.selectbox(
-        "Focus Category:",
-        ["All Categories", "Political (R/D)", "Election Process", "Media", "Issues"]
-    )
+    col1, col2 = st.columns(2)
+    with col1:
+        focus_category = st.selectbox(
+            "Focus Category:",
+            ["All Categories", "Political (R/D)", "Election Process", "Media", "Issues"]
+        )
+    with col2:
+        weighting = st.selectbox(
+            "Link Strength:",
+            ["Co-occurrences", "PMI", "Lift"],
+            help="PMI and lift compare co-occurrence with what chance alone would give"
+        )
+    focus_categories = {
+        "All Categories": list(category_colors),
+        "Political (R/D)": ['Republican', 'Democrat'],
+        "Election Process": ['Process'],
+        "Media": ['Media'],
+        "Issues": ['Issues']
+    }[focus_category]
+    
+    if hashtag_graph is not None:
+        # Most used tags of the focused categories and their strongest links
+        in_focus = np.flatnonzero(np.isin(tag_categories, focus_categories))
+        shown = in_focus[np.argsort(-hashtag_graph.counts[in_focus], kind='stable')[:15]]
+        weighted = reweight(hashtag_graph, {"Co-occurrences": 'count', "PMI": 'pmi', "Lift": 'lift'}[weighting])
+        links = top_cooccurrences(weighted, shown, k=20)
+        
+        all_hashtags = [("#" + hashtag_graph.tags[i], tag_categories[i], int(hashtag_graph.counts[i]))
+                        for i in shown]
+        connections = [("#" + tag1, "#" + tag2, w)
+                       for tag1, tag2, w in zip(links['tag1'], links['tag2'], links['weight'])]
+    else:
+        all_hashtags = [
+            ("#trump", 'Republican', 1242),
+            ("#biden", 'Democrat', 893),
+            ("#maga", 'Republican', 587),
+            ("#bidenharris2020", 'Democrat', 478),
+            ("#election2020", 'Process', 642),
+            ("#vote", 'Process', 523),
+            ("#foxnews", 'Media', 265),
+            ("#cnn", 'Media', 234),
+            ("#covid", 'Issues', 198),
+            ("#economy", 'Issues', 176)
+        ]
+        all_hashtags = [h for h in all_hashtags if h[1] in focus_categories]
+        
+        connections = [
+            ("#trump", "#maga", 1.0),
+            ("#biden", "#bidenharris2020", 1.0),
+            ("#election2020", "#vote", 1.0),
+            ("#foxnews", "#trump", 1.0),
+            ("#cnn", "#biden", 1.0),
+            ("#covid", "#economy", 1.0),
+            ("#trump", "#election2020", 1.0),
+            ("#biden", "#election2020", 1.0)
+        ]
     
     # Create network visualization
     fig, ax = plt.subplots(figsize=(12, 10))
     
-    # Simulate hashtag network
     np.random.seed(42)
     
     # Create positions for different categories
@@ -892,85 +1622,44 @@ elif st.session_state.current_view == 'hashtag':
         'Democrat': (0, -2),
         'Process': (2, 0),
         'Media': (-2, 0),
-        'Issues': (0, 0)
-    }
-    
-    category_colors = {
-        'Republican': '#E74C3C',
-        'Democrat': '#3498DB',
-        'Process': '#F39C12',
-        'Media': '#9B59B6',
-        'Issues': '#2ECC71'
+        'Issues': (0, 0),
+        'Unclassified': (2, 2)
     }
     
-    # Draw hashtags
-    all_hashtags = [
-        ("#trump", 'Republican', 1242),
-        ("#biden", 'Democrat', 893),
-        ("#maga", 'Republican', 587),
-        ("#bidenharris2020", 'Democrat', 478),
-        ("#election2020", 'Process', 642),
-        ("#vote", 'Process', 523),
-        ("#foxnews", 'Media', 265),
-        ("#cnn", 'Media', 234),
-        ("#covid", 'Issues', 198),
-        ("#economy", 'Issues', 176)
-    ]
-    
-    # Position hashtags around their category centers
+    # Position hashtags around their category centers, once per tag
+    tag_category = {tag: category for tag, category, _ in all_hashtags}
+    positions = {}
     for tag, category, freq in all_hashtags:
         center_x, center_y = category_positions[category]
-        
-        # Add some randomness to position
-        x = center_x + np.random.uniform(-0.8, 0.8)
-        y = center_y + np.random.uniform(-0.8, 0.8)
-        
-        # Size based on frequency
-        size = 500 + (freq / 5)
-        
-        ax.plot(x, y, 'o', color=category_colors[category], markersize=np.sqrt(size)/2, alpha=0.8)
-        ax.text(x, y, tag, ha='center', va='center', fontsize=9, fontweight='bold')
-    
-    # Add connections (co-occurrences)
-    connections = [
-        ("#trump", "#maga"),
-        ("#biden", "#bidenharris2020"),
-        ("#election2020", "#vote"),
-        ("#foxnews", "#trump"),
-        ("#cnn", "#biden"),
-        ("#covid", "#economy"),
-        ("#trump", "#election2020"),
-        ("#biden", "#election2020")
-    ]
+        positions[tag] = (center_x + np.random.uniform(-0.8, 0.8), center_y + np.random.uniform(-0.8, 0.8))
+    
+    tag_index = {tag: i for i, (tag, _, _) in enumerate(all_hashtags)}
+    tag_xy = np.array([positions[tag] for tag, _, _ in all_hashtags]).reshape(-1, 2)
     
-    # Draw connections
-    for tag1, tag2 in connections:
-        # Find positions
-        pos1 = None
-        pos2 = None
-        
-        for t, cat, freq in all_hashtags:
-            if t == tag1:
-                center_x, center_y = category_positions[cat]
-                pos1 = (center_x + np.random.uniform(-0.5, 0.5), center_y + np.random.uniform(-0.5, 0.5))
-            if t == tag2:
-                center_x, center_y = category_positions[cat]
-                pos2 = (center_x + np.random.uniform(-0.5, 0.5), center_y + np.random.uniform(-0.5, 0.5))
-        
-        if pos1 and pos2:
+    # Draw connections (co-occurrences) in one batch, thicker for stronger links
+    links = [(tag1, tag2, w) for tag1, tag2, w in connections if tag1 in positions and tag2 in positions]
+    if links:
+        max_weight = max(w for _, _, w in links) or 1.0
+        link_colors, link_widths = [], []
+        for tag1, tag2, w in links:
             # Color based on whether it's cross-category
-            cat1 = next(cat for t, cat, f in all_hashtags if t == tag1)
-            cat2 = next(cat for t, cat, f in all_hashtags if t == tag2)
-            
+            cat1, cat2 = tag_category[tag1], tag_category[tag2]
             if cat1 == cat2:
-                line_color = category_colors[cat1]
-                line_alpha = 0.5
+                link_colors.append(matplotlib.colors.to_rgba(category_colors[cat1], 0.5))
             else:
-                line_color = 'gold'
-                line_alpha = 0.7
-            
-            ax.plot([pos1[0], pos2[0]], [pos1[1], pos2[1]], '-', 
-                   color=line_color, alpha=line_alpha, linewidth=2)
+                link_colors.append(matplotlib.colors.to_rgba('gold', 0.7))
+            link_widths.append(1 + 3 * w / max_weight)
+        draw_edges(ax, tag_xy, [tag_index[t] for t, _, _ in links], [tag_index[t] for _, t, _ in links],
+                   widths=link_widths, colors=link_colors, alpha=None)
+    
+    # Draw hashtags in one batch, sized by frequency
+    if all_hashtags:
+        max_freq = max(freq for _, _, freq in all_hashtags)
+        draw_nodes(ax, tag_xy, sizes=[(500 + 750 * freq / max_freq) / 4 for _, _, freq in all_hashtags],
+                   colors=[category_colors[category] for _, category, _ in all_hashtags])
+    for tag, category, freq in all_hashtags:
+        x, y = positions[tag]
+        ax.text(x, y, tag, ha='center', va='center', fontsize=9, fontweight='bold', zorder=3)
     
     ax.set_xlim(-3, 3)
     ax.set_ylim(-3, 3)
@@ -988,13 +1677,15 @@ elif st.session_state.current_view == 'hashtag':
         Patch(facecolor='#2ECC71', label='Issues'),
         Patch(facecolor='gold', label='Cross-Ideology Links')
     ]
+    if 'Unclassified' in tag_category.values():
+        legend_elements.insert(5, Patch(facecolor='#95A5A6', label='Unclassified'))
     
     ax.legend(handles=legend_elements, loc='upper left', fontsize=9, framealpha=0.9)
     
     st.pyplot(fig)
     
     # Download button
-    st.markdown(get_image_download_link(fig, "hashtag_network.png"), unsafe_allow_html=True)
+    figure_download_button(fig, "hashtag_network.png", focus_category, weighting)
 
 # ===== VIRAL CONTENT PAGE =====
 elif st.session_state.current_view == 'viral':
@@ -1002,6 +1693,18 @@ elif st.session_state.current_view == 'viral':
     
     tab1, tab2, tab3 = st.tabs(["📊 Engagement Metrics", "🎯 Content Patterns", "📈 Success Factors"])
     
+    engagement_summary = load_engagement()
+    engagement_cube = load_engagement_cube(engagement_summary)
+    if engagement_cube is not None and engagement_cube.cells.empty:
+        engagement_cube = None
+    
+    # Hours with the highest average engagement
+    if engagement_cube is not None:
+        top_hours = peak_hours(engagement_cube)
+    else:
+        top_hours = [9, 12, 18]
+    top_hours_text = ", ".join(f"{h % 12 or 12} {'AM' if h < 12 else 'PM'}" for h in top_hours)
+    
     with tab1:
         st.markdown("### What Makes a Tweet Go Viral?")
         
@@ -1010,46 +1713,58 @@ elif st.session_state.current_view == 'viral':
         with col1:
             st.markdown("#### Top 5 Viral Tweets")
             
-            viral_tweets = [
-                {
-                    "user": "@breakingnews",
-                    "content": "BREAKING: Election results show tight race in key battleground states...",
-                    "likes": 24567,
-                    "retweets": 18943,
-                    "engagement": 43510
-                },
-                {
-                    "user": "@politicalanalyst",
-                    "content": "Thread: Why this election is unlike any other in US history...",
-                    "likes": 18932,
-                    "retweets": 15432,
-                    "engagement": 34364
-                },
-                {
-                    "user": "@votermobilize",
-                    "content": "🚨 URGENT: Polls close in 2 hours. If you haven't voted yet, GO NOW!",
-                    "likes": 16789,
-                    "retweets": 14210,
-                    "engagement": 30999
-                },
-                {
-                    "user": "@celebrityendorser",
-                    "content": "Proud to cast my vote for @joebiden today. The future of our democracy is at stake.",
-                    "likes": 15432,
-                    "retweets": 12345,
-                    "engagement": 27777
-                },
-                {
-                    "user": "@factchecker",
-                    "content": "FACT CHECK: Claims about mail-in voting being fraudulent are false.",
-                    "likes": 14321,
-                    "retweets": 11876,
-                    "engagement": 26197
-                }
-            ]
+            if engagement_summary is not None:
+                viral_tweets = [
+                    {
+                        "user": tweet['user'],
+                        "content": tweet['text'],
+                        "likes": tweet['likes'],
+                        "retweets": tweet['retweets'],
+                        "engagement": tweet['engagement']
+                    }
+                    for tweet in engagement_summary['top_tweets'].to_dict('records')
+                ]
+            else:
+                viral_tweets = [
+                    {
+                        "user": "@breakingnews",
+                        "content": "BREAKING: Election results show tight race in key battleground states...",
+                        "likes": 24567,
+                        "retweets": 18943,
+                        "engagement": 43510
+                    },
+                    {
+                        "user": "@politicalanalyst",
+                        "content": "Thread: Why this election is unlike any other in US history...",
+                        "likes": 18932,
+                        "retweets": 15432,
+                        "engagement": 34364
+                    },
+                    {
+                        "user": "@votermobilize",
+                        "content": "🚨 URGENT: Polls close in 2 hours. If you haven't voted yet, GO NOW!",
+                        "likes": 16789,
+                        "retweets": 14210,
+                        "engagement": 30999
+                    },
+                    {
+                        "user": "@celebrityendorser",
+                        "content": "Proud to cast my vote for @joebiden today. The future of our democracy is at stake.",
+                        "likes": 15432,
+                        "retweets": 12345,
+                        "engagement": 27777
+                    },
+                    {
+                        "user": "@factchecker",
+                        "content": "FACT CHECK: Claims about mail-in voting being fraudulent are false.",
+                        "likes": 14321,
+                        "retweets": 11876,
+                        "engagement": 26197
+                    }
+                ]
             
             for i, tweet in enumerate(viral_tweets, 1):
-                with st.expander(f"{i}. @{tweet['user']} - {tweet['engagement']:,} engagement"):
+                with st.expander(f"{i}. @{str(tweet['user']).lstrip('@')} - {tweet['engagement']:,} engagement"):
                     st.markdown(f"**Tweet:** {tweet['content']}")
                     st.markdown(f"**👍 Likes:** {tweet['likes']:,}")
                     st.markdown(f"**🔁 Retweets:** {tweet['retweets']:,}")
@@ -1061,11 +1776,19 @@ elif st.session_state.current_view == 'viral':
             # Create histogram
             fig, ax = plt.subplots(figsize=(8, 5))
             
-            # Simulate engagement data
-            np.random.seed(42)
-            engagement = np.random.lognormal(mean=5, sigma=1.5, size=1000)
-            
-            ax.hist(engagement, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
+            if engagement_summary is not None:
+                # Pre-binned counts from the engagement summary
+                edges = engagement_summary['histogram_edges']
+                ax.hist(edges[:-1], bins=edges, weights=engagement_summary['histogram'],
+                       alpha=0.7, color='skyblue', edgecolor='black')
+                threshold = engagement_summary['viral_threshold']
+            else:
+                # Simulate engagement data
+                np.random.seed(42)
+                engagement = np.random.lognormal(mean=5, sigma=1.5, size=1000)
+                
+                ax.hist(engagement, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
+                threshold = np.percentile(engagement, 95)
             ax.set_xlabel("Engagement Score", fontsize=10)
             ax.set_ylabel("Number of Tweets", fontsize=10)
             ax.set_title("Engagement Distribution (Log Scale)", fontsize=12)
@@ -1073,7 +1796,6 @@ elif st.session_state.current_view == 'viral':
             ax.grid(True, alpha=0.3)
             
             # Add vertical line for viral threshold
-            threshold = np.percentile(engagement, 95)
             ax.axvline(x=threshold, color='red', linestyle='--', linewidth=2)
             ax.text(threshold*1.1, ax.get_ylim()[1]*0.8, 
                    f'Viral Threshold\n({threshold:.0f}+)', 
@@ -1083,9 +1805,17 @@ elif st.session_state.current_view == 'viral':
             
             st.markdown("---")
             st.markdown("#### 📈 Engagement Metrics")
-            st.metric("Average Likes", "84")
-            st.metric("Average Retweets", "23")
-            st.metric("Viral Rate (Top 5%)", "4.8%")
+            if engagement_summary is not None:
+                st.metric("Average Likes", f"{engagement_summary['average_likes']:,.0f}")
+                st.metric("Average Retweets", f"{engagement_summary['average_retweets']:,.0f}")
+                st.metric("Viral Rate (Top 5%)", f"{engagement_summary['viral_rate']:.1%}")
+                st.caption(f"Viral threshold (95th percentile, streaming estimate): "
+                           f"{engagement_summary['viral_threshold']:,.0f} likes + retweets "
+                           f"over {engagement_summary['tweets']:,} tweets")
+            else:
+                st.metric("Average Likes", "84")
+                st.metric("Average Retweets", "23")
+                st.metric("Viral Rate (Top 5%)", "4.8%")
     
     with tab2:
         st.markdown("### Content Patterns in Viral Tweets")
@@ -1114,11 +1844,18 @@ elif st.session_state.current_view == 'viral':
             # Time series of engagement
             fig, ax = plt.subplots(figsize=(8, 4))
             
-            hours = np.arange(24)
-            engagement_by_hour = 1000 + 500 * np.sin(2*np.pi*hours/24 + np.pi/4) + 200 * np.random.randn(24)
+            if engagement_cube is not None:
+                by_hour = engagement_cube.rollup('hour')['average_engagement'].reindex(range(24), fill_value=0.0)
+                hours = by_hour.index.to_numpy()
+                engagement_by_hour = by_hour.to_numpy()
+                baseline = engagement_by_hour.mean()
+            else:
+                hours = np.arange(24)
+                engagement_by_hour = 1000 + 500 * np.sin(2*np.pi*hours/24 + np.pi/4) + 200 * np.random.randn(24)
+                baseline = 1000
             
             ax.plot(hours, engagement_by_hour, 'b-', linewidth=2, marker='o')
-            ax.fill_between(hours, engagement_by_hour, 1000, alpha=0.3, color='blue')
+            ax.fill_between(hours, engagement_by_hour, baseline, alpha=0.3, color='blue')
             
             ax.set_xlabel("Hour of Day (EST)", fontsize=10)
             ax.set_ylabel("Average Engagement", fontsize=10)
@@ -1127,8 +1864,7 @@ elif st.session_state.current_view == 'viral':
             ax.grid(True, alpha=0.3)
             
             # Highlight peak times
-            peak_hours = [9, 12, 18]
-            for hour in peak_hours:
+            for hour in top_hours:
                 ax.axvline(x=hour, color='red', linestyle=':', alpha=0.5)
                 ax.text(hour, ax.get_ylim()[1]*0.9, f'Peak\n{hour}:00', 
                        ha='center', fontsize=8, color='red')
@@ -1141,9 +1877,25 @@ elif st.session_state.current_view == 'viral':
         # Political content comparison
         fig, ax = plt.subplots(figsize=(10, 5))
         
-        categories = ['Pro-Trump', 'Pro-Biden', 'Neutral/Media', 'Issue-Focused', 'Other']
-        engagement = [2450, 1980, 3120, 1760, 850]
-        virality = [12.5, 10.8, 18.2, 9.4, 4.3]
+        if engagement_cube is not None:
+            # Tweets grouped by the category of their first classified hashtag
+            by_category = engagement_cube.rollup('category')
+            category_names = {
+                'Republican': 'Pro-Trump',
+                'Democrat': 'Pro-Biden',
+                'Media': 'Neutral/Media',
+                'Issues': 'Issue-Focused',
+                'Process': 'Election Process',
+                NO_CATEGORY: 'Other'
+            }
+            by_category = by_category.reindex([c for c in category_names if c in by_category.index])
+            categories = [category_names[c] for c in by_category.index]
+            engagement = by_category['average_engagement'].to_numpy()
+            virality = 100 * by_category['viral_rate'].to_numpy()
+        else:
+            categories = ['Pro-Trump', 'Pro-Biden', 'Neutral/Media', 'Issue-Focused', 'Other']
+            engagement = [2450, 1980, 3120, 1760, 850]
+            virality = [12.5, 10.8, 18.2, 9.4, 4.3]
         
         x = np.arange(len(categories))
         width = 0.35
@@ -1164,13 +1916,13 @@ elif st.session_state.current_view == 'viral':
     with tab3:
         st.markdown("### 🧠 Success Factor Analysis")
         
-        st.markdown("""
+        st.markdown(f"""
         <div class="insight-box">
         <h3>🎯 What Drives Virality?</h3>
         
         **Primary Drivers:**
         1. **Emotional Resonance** - Tweets evoking strong emotions (anger, hope, fear)
-        2. **Timing** - Posted during peak engagement hours (9 AM, 12 PM, 6 PM EST)
+        2. **Timing** - Posted during peak engagement hours ({top_hours_text} EST)
         3. **Network Position** - Shared by users with high betweenness centrality
         4. **Content Format** - Images/videos + text perform 3x better than text alone
         
@@ -1212,7 +1964,7 @@ elif st.session_state.current_view == 'viral':
             
             recommendations = [
                 "✅ **Use emotional triggers** (questions, exclamations)",
-                "✅ **Post during peak hours** (9 AM, 12 PM, 6 PM EST)",
+                f"✅ **Post during peak hours** ({top_hours_text} EST)",
                 "✅ **Include visual content** (images/videos increase engagement 3x)",
                 "✅ **Target bridge users** (accounts that connect communities)",
                 "✅ **Use 2-3 relevant hashtags** (optimal number for visibility)",
@@ -1,7 +1,11 @@
-import pandas as pd
 import os
 import sys
 
+# Make the project's src modules importable when run from notebooks/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_loader import load_twitter_data
+
 print("=" * 50)
 print("TESTING DATA LOADING")
 print("=" * 50)
@@ -17,9 +21,11 @@ print(f"File exists: {os.path.exists(file_path)}")
 if os.path.exists(file_path):
     print("\n✅ File found! Trying to load...")
     
-    # Try to read just first 1000 rows to test
+    # Load through the columnar cache rather than parsing the CSV again
     try:
-        df = pd.read_csv(file_path, nrows=1000)
+        df = load_twitter_data(file_path)
+        if df is None:
+            raise FileNotFoundError(file_path)
         print(f"✅ Successfully loaded {len(df)} rows")
         
         print(f"\nColumns found: {list(df.columns)}")
@@ -0,0 +1,80 @@
+import glob
+import os
+import pickle
+import time
+
+from src.data_loader import default_data_path, file_fingerprint
+
+# Bump when the layout of the bundle changes so stale bundles are rebuilt
+ARTIFACT_FORMAT_VERSION = 1
+
+def default_artifact_dir():
+    """
+    Directory holding the precomputed analysis bundles
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(os.path.dirname(current_dir), 'data', 'artifacts')
+
+def bundle_path(fingerprint, artifact_dir=None):
+    """
+    Location of the bundle computed from the input with this fingerprint
+    """
+    if artifact_dir is None:
+        artifact_dir = default_artifact_dir()
+    return os.path.join(artifact_dir, f"analysis-v{ARTIFACT_FORMAT_VERSION}-{fingerprint}.pkl")
+
+def save_bundle(artifacts, fingerprint, artifact_dir=None, source=None):
+    """
+    Write the analysis artifacts for an input fingerprint to disk
+    """
+    path = bundle_path(fingerprint, artifact_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    bundle = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'fingerprint': fingerprint,
+        'source': source,
+        'created_at': time.time(),
+        'artifacts': artifacts,
+    }
+
+    # Write to a temp file first so readers never see a partial bundle
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+def load_bundle(fingerprint, artifact_dir=None):
+    """
+    Load the bundle matching an input fingerprint, or None if there is none
+    """
+    path = bundle_path(fingerprint, artifact_dir)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        bundle = pickle.load(f)
+
+    if bundle.get('format_version') != ARTIFACT_FORMAT_VERSION or bundle.get('fingerprint') != fingerprint:
+        return None
+    return bundle
+
+def load_bundle_for_file(file_path=None, artifact_dir=None):
+    """
+    Load the bundle computed from the current contents of a tweet file
+    """
+    if file_path is None:
+        file_path = default_data_path()
+    if not os.path.exists(file_path):
+        return None
+    return load_bundle(file_fingerprint(file_path), artifact_dir)
+
+def list_bundles(artifact_dir=None):
+    """
+    Paths of all stored bundles, newest first
+    """
+    if artifact_dir is None:
+        artifact_dir = default_artifact_dir()
+    paths = glob.glob(os.path.join(artifact_dir, 'analysis-v*.pkl'))
+    return sorted(paths, key=os.path.getmtime, reverse=True)
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.centrality import approximate_betweenness
+from src.communities import symmetrize
+from src.graph_builder import MentionGraph
+
+# Users with the highest bridge potential that get the betweenness refinement
+DEFAULT_CANDIDATES = 200
+
+# BFS sources sampled for the boundary betweenness
+DEFAULT_BOUNDARY_SOURCES = 64
+
+def _row_argmax(K):
+    # Column of the largest entry in every row of a CSR matrix, -1 for
+    # empty rows; ties go to the first stored entry
+    n = K.shape[0]
+    counts = np.diff(K.indptr)
+    nonempty = np.flatnonzero(counts)
+    row_max = np.full(n, -np.inf)
+    row_max[nonempty] = np.maximum.reduceat(K.data, K.indptr[nonempty])
+    rows = np.repeat(np.arange(n), counts)
+    hit = np.flatnonzero(K.data == row_max[rows])
+    first_rows, first = np.unique(rows[hit], return_index=True)
+    result = np.full(n, -1, dtype=np.int64)
+    result[first_rows] = K.indices[hit[first]]
+    return result
+
+def _participation(W, labels, handles):
+    n = W.shape[0]
+    n_communities = int(labels.max()) + 1 if n else 0
+    W = W.tocoo()
+
+    # Interaction weight from every user into every community
+    K = sp.csr_matrix((W.data, (W.row, labels[W.col])), shape=(n, n_communities))
+    K.sum_duplicates()
+    strength = np.asarray(K.sum(axis=1)).ravel()
+    squares = np.asarray(K.multiply(K).sum(axis=1)).ravel()
+
+    # Split off the weight into the user's own community
+    rows = np.repeat(np.arange(n), np.diff(K.indptr))
+    is_own = K.indices == labels[rows]
+    own = np.bincount(rows[is_own], weights=K.data[is_own], minlength=n)
+    K.data[is_own] = 0.0
+    K.eliminate_zeros()
+
+    active = strength > 0
+    participation = np.zeros(n)
+    participation[active] = 1.0 - squares[active] / strength[active] ** 2
+    cross = strength - own
+
+    return pd.DataFrame({
+        'user': handles,
+        'community': labels,
+        'strength': strength,
+        'cross_weight': cross,
+        'cross_share': np.divide(cross, strength, out=np.zeros(n), where=active),
+        'partner_community': _row_argmax(K),
+        'participation': participation,
+    })
+
+def community_participation(graph, labels):
+    """
+    How each user's interactions spread over communities.
+
+    Returns a DataFrame with the user's community, total interaction
+    weight (mentions made plus received), the weight crossing into other
+    communities, its share, the other community receiving most of it
+    (-1 if none) and the participation coefficient 1 - sum_s (k_is / k_i)^2.
+    """
+    return _participation(symmetrize(graph.adjacency), np.asarray(labels), graph.handles)
+
+def _boundary_betweenness(W, labels, handles, k, seed, n_jobs):
+    coo = W.tocoo()
+    boundary = np.unique(coo.row[labels[coo.row] != labels[coo.col]])
+    sub = MentionGraph(W[boundary][:, boundary], handles[boundary])
+    betweenness, _ = approximate_betweenness(sub, k=k, seed=seed, n_jobs=n_jobs)
+    return boundary, betweenness
+
+def boundary_betweenness(graph, labels, k=DEFAULT_BOUNDARY_SOURCES, seed=42, n_jobs=None):
+    """
+    Betweenness within the boundary subgraph, estimated from k sampled sources.
+
+    Only users with at least one cross-community interaction are kept, so
+    the BFS runs on a much smaller graph than the full one. Returns
+    (boundary_nodes, betweenness) with one value per boundary node.
+    """
+    return _boundary_betweenness(symmetrize(graph.adjacency), np.asarray(labels), graph.handles,
+                                 k, seed, n_jobs)
+
+def detect_bridges(graph, labels, n_candidates=DEFAULT_CANDIDATES, k=DEFAULT_BOUNDARY_SOURCES, seed=42,
+                   n_jobs=None):
+    """
+    Per-user bridge table, strongest bridges first.
+
+    Every user gets a bridge potential from one vectorized pass over the
+    edges: participation coefficient x log(1 + cross-community weight).
+    The `n_candidates` users with the highest potential are then ranked
+    by sampled betweenness on the boundary subgraph; `bridge_score`
+    combines both (1 for the strongest bridge). Users outside the
+    candidate set keep a zero `boundary_betweenness`.
+    """
+    labels = np.asarray(labels)
+    W = symmetrize(graph.adjacency)
+    table = _participation(W, labels, graph.handles)
+    potential = table['participation'].to_numpy() * np.log1p(table['cross_weight'].to_numpy())
+    table['bridge_potential'] = potential
+    table['boundary_betweenness'] = 0.0
+    table['candidate'] = False
+
+    candidates = np.flatnonzero(potential > 0)
+    if len(candidates) > n_candidates:
+        candidates = candidates[np.argpartition(-potential[candidates], n_candidates - 1)[:n_candidates]]
+    table.loc[candidates, 'candidate'] = True
+
+    if len(candidates):
+        boundary, betweenness = _boundary_betweenness(W, labels, graph.handles, k, seed, n_jobs)
+        position = np.searchsorted(boundary, candidates)
+        table.loc[candidates, 'boundary_betweenness'] = betweenness[position]
+
+    # Both signals scaled to [0, 1]; betweenness only separates candidates
+    scaled_potential = potential / max(potential.max(), 1e-12) if len(potential) else potential
+    between = table['boundary_betweenness'].to_numpy()
+    scaled_between = between / max(between.max(), 1e-12) if len(between) else between
+    score = np.where(table['candidate'], 0.5 * (scaled_potential + scaled_between), 0.5 * scaled_potential)
+    table['bridge_score'] = score / max(score.max(), 1e-12) if len(score) else score
+
+    return table.sort_values('bridge_score', ascending=False, kind='stable')
+
+def top_bridges(bridges, k=5):
+    """
+    The k users with the highest bridge score
+    """
+    return bridges.head(k)
@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.graph_builder import row_positions
+from src.parallel import parallel_map, worker_count
+
+# Number of BFS sources sampled for approximate betweenness / closeness
+DEFAULT_SAMPLE_SOURCES = 256
+
+def weighted_in_degree(graph):
+    """
+    Mentions received by each user
+    """
+    return np.asarray(graph.adjacency.sum(axis=0)).ravel()
+
+def weighted_out_degree(graph):
+    """
+    Mentions made by each user
+    """
+    return np.asarray(graph.adjacency.sum(axis=1)).ravel()
+
+def degree_centrality(graph):
+    """
+    In-, out- and total degree centrality (distinct neighbours / (n - 1))
+    """
+    scale = 1.0 / max(graph.n_nodes - 1, 1)
+    in_deg = graph.in_degree() * scale
+    out_deg = graph.out_degree() * scale
+    return in_deg, out_deg, in_deg + out_deg
+
+def pagerank(graph, alpha=0.85, tol=1e-8, max_iter=100):
+    """
+    Weighted PageRank by sparse power iteration.
+
+    Rank mass of users who mention nobody is spread uniformly, as in networkx.
+    """
+    n = graph.n_nodes
+    if n == 0:
+        return np.zeros(0)
+
+    out_weight = weighted_out_degree(graph)
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+
+    # Column-stochastic transition matrix, transposed once up front
+    transition_t = (sp.diags(inv_out) @ graph.adjacency).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = rank
+        rank = alpha * (transition_t @ rank + previous[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(rank - previous).sum() < n * tol:
+            break
+    return rank / rank.sum()
+
+def eigenvector_centrality(graph, tol=1e-8, max_iter=200):
+    """
+    Eigenvector centrality of the symmetrised mention graph by power iteration.
+
+    Mention graphs are far from strongly connected, so the directed
+    eigenvector would collapse to zero on most users; the undirected
+    graph (shifted by the identity to guarantee convergence) is used instead.
+    """
+    n = graph.n_nodes
+    if n == 0:
+        return np.zeros(0)
+
+    A = graph.adjacency
+    sym = (A + A.T + sp.identity(n, format='csr')).tocsr()
+
+    x = np.full(n, 1.0 / np.sqrt(n))
+    for _ in range(max_iter):
+        previous = x
+        x = sym @ x
+        norm = np.linalg.norm(x)
+        if norm == 0:
+            return x
+        x /= norm
+        if np.abs(x - previous).sum() < n * tol:
+            break
+    return x
+
+def _bfs(indptr, indices, source, n):
+    # Level-synchronous BFS counting shortest paths (sigma) to every node
+    dist = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n)
+    dist[source] = 0
+    sigma[source] = 1.0
+
+    levels = []
+    frontier = np.array([source])
+    depth = 0
+    while frontier.size:
+        levels.append(frontier)
+        # Gather every out-edge of the frontier in one shot
+        edge_pos, counts = row_positions(indptr, frontier)
+        if not len(edge_pos):
+            break
+        targets = indices[edge_pos]
+        weights = np.repeat(sigma[frontier], counts)
+
+        # Paths into newly discovered nodes; every path count is positive,
+        # so the non-zero entries are exactly the next frontier
+        undiscovered = dist[targets] == -1
+        new_paths = np.bincount(targets[undiscovered], weights=weights[undiscovered], minlength=n)
+        frontier = np.flatnonzero(new_paths)
+        depth += 1
+        dist[frontier] = depth
+        sigma += new_paths
+    return dist, sigma, levels
+
+def _betweenness_worker(args):
+    # Brandes dependency accumulation for a batch of sources
+    indptr, indices, n, sources = args
+    total = np.zeros(n)
+    total_sq = np.zeros(n)
+
+    for source in sources:
+        dist, sigma, levels = _bfs(indptr, indices, source, n)
+        delta = np.zeros(n)
+        coef = np.zeros(n)
+        for frontier in reversed(levels[:-1]):
+            edge_pos, counts = row_positions(indptr, frontier)
+            targets = indices[edge_pos]
+
+            # Only edges into the next BFS level lie on shortest paths
+            child_level = dist[targets] == dist[frontier[0]] + 1
+            child = targets[child_level]
+            coef[child] = (1.0 + delta[child]) / sigma[child]
+
+            rows = np.repeat(np.arange(frontier.size), counts)[child_level]
+            delta[frontier] = sigma[frontier] * np.bincount(rows, weights=coef[child], minlength=frontier.size)
+
+        delta[source] = 0.0
+        total += delta
+        total_sq += delta * delta
+    return total, total_sq
+
+def _closeness_worker(args):
+    # Distance sums and reach counts from a batch of sources
+    indptr, indices, n, sources = args
+    reached = np.zeros(n)
+    dist_sum = np.zeros(n)
+
+    for source in sources:
+        dist, _, _ = _bfs(indptr, indices, source, n)
+        hit = dist > 0
+        reached[hit] += 1
+        dist_sum[hit] += dist[hit]
+    return reached, dist_sum
+
+def _run_on_sources(worker, graph, sources, n_jobs):
+    # Split the sampled sources into batches and run them in a process pool
+    A = graph.adjacency
+    indptr = A.indptr.astype(np.int64)
+    indices = A.indices.astype(np.int64)
+    n = graph.n_nodes
+
+    n_jobs = worker_count(n_jobs, len(sources))
+    batches = [(indptr, indices, n, batch) for batch in np.array_split(sources, n_jobs)]
+    results = parallel_map(worker, batches, n_jobs)
+
+    return [sum(parts) for parts in zip(*results)]
+
+def _sample_sources(n, k, seed):
+    rng = np.random.default_rng(seed)
+    if k is None or k >= n:
+        return np.arange(n)
+    return rng.choice(n, size=k, replace=False)
+
+def approximate_betweenness(graph, k=DEFAULT_SAMPLE_SOURCES, normalized=True, seed=42, n_jobs=None):
+    """
+    Betweenness estimated from k sampled BFS sources (Brandes-Pich).
+
+    Returns (betweenness, stderr) where stderr is the standard error of
+    each estimate from the spread of the per-source dependencies; the
+    true value is within about 2 * stderr with ~95% confidence.
+    """
+    n = graph.n_nodes
+    if n < 3:
+        return np.zeros(n), np.zeros(n)
+
+    sources = _sample_sources(n, k, seed)
+    total, total_sq = _run_on_sources(_betweenness_worker, graph, sources, n_jobs)
+
+    n_samples = len(sources)
+    mean = total / n_samples
+    var = np.maximum(total_sq / n_samples - mean ** 2, 0.0)
+
+    # Scale the mean dependency per source up to all n sources
+    scale = n
+    if normalized:
+        scale /= (n - 1) * (n - 2)
+    stderr = np.sqrt(var / n_samples) if n_samples < n else np.zeros(n)
+    return mean * scale, stderr * scale
+
+def approximate_closeness(graph, k=DEFAULT_SAMPLE_SOURCES, seed=42, n_jobs=None):
+    """
+    Closeness (incoming distance, Wasserman-Faust scaled) from k sampled sources.
+
+    Matches networkx's `closeness_centrality` when k >= n.
+    """
+    n = graph.n_nodes
+    if n < 2:
+        return np.zeros(n)
+
+    sources = _sample_sources(n, k, seed)
+    reached, dist_sum = _run_on_sources(_closeness_worker, graph, sources, n_jobs)
+
+    # Fraction of sampled sources that reach each node, scaled to all others
+    n_samples = len(sources)
+    reach = reached * (n - 1) / n_samples if n_samples < n else reached
+    mean_dist = np.divide(dist_sum, reached, out=np.zeros(n), where=reached > 0)
+    return np.divide(reach / (n - 1), mean_dist, out=np.zeros(n), where=mean_dist > 0)
+
+def compute_centralities(graph, k=DEFAULT_SAMPLE_SOURCES, seed=42, n_jobs=None):
+    """
+    Per-user table of every centrality offered in the Key Influencers view
+    """
+    in_deg, out_deg, total_deg = degree_centrality(graph)
+    betweenness, betweenness_err = approximate_betweenness(graph, k=k, seed=seed, n_jobs=n_jobs)
+
+    return pd.DataFrame({
+        'user': graph.handles,
+        'mentions_received': weighted_in_degree(graph),
+        'mentions_made': weighted_out_degree(graph),
+        'in_degree': graph.in_degree(),
+        'out_degree': graph.out_degree(),
+        'in_degree_centrality': in_deg,
+        'out_degree_centrality': out_deg,
+        'degree_centrality': total_deg,
+        'betweenness': betweenness,
+        'betweenness_stderr': betweenness_err,
+        'closeness': approximate_closeness(graph, k=k, seed=seed, n_jobs=n_jobs),
+        'pagerank': pagerank(graph),
+        'eigenvector': eigenvector_centrality(graph),
+    })
+
+def top_users(centralities, column, k=10):
+    """
+    The k users with the highest value of `column`
+    """
+    return centralities.nlargest(k, column)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse.csgraph import connected_components
+
+from src.graph_builder import row_positions
+
+def weak_components(graph):
+    """
+    (n_components, labels) of the weakly connected components.
+
+    scipy's csgraph runs a linear-time traversal in C directly on the
+    CSR arrays (int32 indices are used without a copy).
+    """
+    return connected_components(graph.adjacency, directed=True, connection='weak')
+
+def strong_components(graph):
+    """
+    (n_components, labels) of the strongly connected components.
+
+    scipy's csgraph runs an iterative Tarjan (Pearce's variant) on the
+    CSR arrays: linear in nodes plus edges and never recursing.
+    """
+    return connected_components(graph.adjacency, directed=True, connection='strong')
+
+def core_numbers(graph):
+    """
+    k-core number of every user in the undirected, unweighted mention graph.
+
+    Batch peeling: at level k every node with at most k remaining
+    neighbours is removed at once and the degrees of its neighbours are
+    decremented together, so each edge is processed once.
+    """
+    n = graph.n_nodes
+    A = graph.adjacency
+    S = (A + A.T).tocsr()
+    S.setdiag(0)
+    S.eliminate_zeros()
+    indptr, indices = S.indptr, S.indices
+
+    degree = np.diff(indptr).astype(np.int64)
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    k = 0
+    remaining = n
+    while remaining:
+        k = max(k, int(degree[alive].min()))
+        frontier = np.flatnonzero(alive & (degree <= k))
+        while len(frontier):
+            core[frontier] = k
+            alive[frontier] = False
+            remaining -= len(frontier)
+
+            # Neighbours of every removed node, gathered from the CSR rows
+            neighbours = indices[row_positions(indptr, frontier)[0]]
+            candidates, lost = np.unique(neighbours[alive[neighbours]], return_counts=True)
+            degree[candidates] -= lost
+            frontier = candidates[degree[candidates] <= k]
+    return core
+
+def size_distribution(labels):
+    """
+    Number of components of each size, largest size first
+    """
+    sizes = np.bincount(labels) if len(labels) else np.zeros(0, dtype=np.int64)
+    size, count = np.unique(sizes[sizes > 0], return_counts=True)
+    return pd.DataFrame({'size': size, 'components': count}).iloc[::-1].reset_index(drop=True)
+
+def largest_component(labels):
+    """
+    Node indices of the largest component of a labelling
+    """
+    if not len(labels):
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(labels == np.bincount(labels).argmax())
+
+def component_analysis(graph):
+    """
+    Component and core structure of the mention graph.
+
+    Returns weak / strong component labels and counts, the giant (largest
+    weak) component, the k-core number of every user, size distributions
+    of both component kinds and how many users are in each k-core.
+    """
+    n_weak, weak_labels = weak_components(graph)
+    n_strong, strong_labels = strong_components(graph)
+    core = core_numbers(graph)
+    giant = largest_component(weak_labels)
+    n = graph.n_nodes
+
+    max_core = int(core.max()) if n else 0
+    # Users in the k-core are those with core number >= k
+    in_core = np.bincount(core, minlength=max_core + 1)[::-1].cumsum()[::-1]
+
+    return {
+        'n_weak': n_weak,
+        'n_strong': n_strong,
+        'weak_labels': weak_labels,
+        'strong_labels': strong_labels,
+        'giant_component': giant,
+        'giant_share': len(giant) / n if n else 0.0,
+        'largest_strong': int(np.bincount(strong_labels).max()) if n else 0,
+        'core': core,
+        'max_core': max_core,
+        'weak_sizes': size_distribution(weak_labels),
+        'strong_sizes': size_distribution(strong_labels),
+        'core_sizes': pd.DataFrame({'k': np.arange(max_core + 1), 'users': in_core}),
+    }
+
+def core_nodes(components, k):
+    """
+    Node indices of the k-core: users whose core number is at least k
+    """
+    return np.flatnonzero(components['core'] >= k)
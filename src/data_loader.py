@@ -1,18 +1,255 @@
 import pandas as pd
+import codecs
+import glob
+import hashlib
 import os
+import re
 import sys
 
-def load_twitter_data(file_path=None):
+# Bytes read from the start of the file to guess its encoding
+ENCODING_SNIFF_BYTES = 1 << 20
+
+# Default number of tweets per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 100_000
+
+# Bytes hashed from each end of the file for the cache fingerprint
+FINGERPRINT_BLOCK_BYTES = 1 << 20
+
+# Size of the fingerprint digest (twice as many hex characters)
+FINGERPRINT_DIGEST_BYTES = 12
+
+# Canonical tweet fields: (column aliases in order of preference, kind)
+# Kinds: 'text' free text, 'category' repeated labels, 'count' non-negative
+# integers, 'datetime' timestamps, 'id' identifiers kept as loaded
+TWEET_SCHEMA = {
+    'tweet_id': (['tweet_id', 'id', 'id_str'], 'id'),
+    'created_at': (['created_at', 'date', 'timestamp'], 'datetime'),
+    'text': (['text', 'tweet', 'content'], 'text'),
+    'user': (['user_screen_name', 'user_name', 'username', 'user'], 'category'),
+    'likes': (['likes', 'like_count', 'favorite_count'], 'count'),
+    'retweets': (['retweet_count', 'retweets'], 'count'),
+    'followers': (['user_followers_count', 'followers_count'], 'count'),
+}
+
+# Every 'count' field gets this one dtype whatever the file's values, so
+# sums of counts never wrap around
+COUNT_DTYPE = 'int64'
+
+# Bumped whenever apply_schema changes the stored dtypes, so projection
+# caches written by an older schema are not reused
+SCHEMA_VERSION = 2
+
+# Fields the network and engagement analyses actually use
+ANALYSIS_COLUMNS = ['tweet_id', 'created_at', 'text', 'user', 'likes', 'retweets']
+
+def _project_root():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.dirname(current_dir)
+
+def default_data_path():
+    """
+    Path of the raw election tweets CSV inside the project
+    """
+    return os.path.join(_project_root(), 'data', 'raw', 'election_tweets_sample.csv')
+
+def default_cache_dir():
+    """
+    Directory holding the columnar copies of the raw CSV files
+    """
+    return os.path.join(_project_root(), 'data', 'cache')
+
+def file_fingerprint(file_path):
+    """
+    Short fingerprint of a file from its size, mtime and a content hash.
+    
+    Only the first and last blocks are hashed so fingerprinting a
+    multi-GB dump stays cheap; size and mtime catch edits in between.
+    """
+    stat = os.stat(file_path)
+    h = hashlib.blake2b(digest_size=FINGERPRINT_DIGEST_BYTES)
+    h.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(file_path, 'rb') as f:
+        h.update(f.read(FINGERPRINT_BLOCK_BYTES))
+        if stat.st_size > 2 * FINGERPRINT_BLOCK_BYTES:
+            f.seek(-FINGERPRINT_BLOCK_BYTES, os.SEEK_END)
+            h.update(f.read())
+    return h.hexdigest()
+
+def _cache_stem(file_path, tag=None):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return f"{stem}.{tag}" if tag else stem
+
+def columnar_cache_path(file_path, cache_dir=None, tag=None):
+    """
+    Location of the Arrow cache for `file_path` at its current fingerprint.
+    
+    `tag` distinguishes caches of different column projections.
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    return os.path.join(cache_dir, f"{_cache_stem(file_path, tag)}-{file_fingerprint(file_path)}.arrow")
+
+def read_columnar_cache(file_path, cache_dir=None, tag=None):
+    """
+    Load the cached copy of `file_path`, or None when there is no valid cache
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        return None
+    
+    cache_path = columnar_cache_path(file_path, cache_dir, tag)
+    if not os.path.exists(cache_path):
+        return None
+    
+    # Uncompressed Arrow IPC is memory-mapped, no parsing involved
+    table = feather.read_table(cache_path, memory_map=True)
+    return table.to_pandas()
+
+def write_columnar_cache(df, file_path, cache_dir=None, tag=None):
+    """
+    Save `df` as the Arrow cache of `file_path` and drop stale versions.
+    
+    Returns the cache path, or None when pyarrow is not installed.
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        print("pyarrow not installed, skipping columnar cache")
+        return None
+    
+    cache_path = columnar_cache_path(file_path, cache_dir, tag)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    
+    # Write to a temp file first so a crash never leaves a half-written cache
+    tmp_path = cache_path + '.tmp'
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, cache_path)
+    
+    # Only exact "<stem>-<fingerprint>.arrow" names are older versions;
+    # "<stem>-full-<fingerprint>.arrow" belongs to another source file
+    stem = _cache_stem(file_path, tag)
+    stale = re.compile(re.escape(stem) + r'-[0-9a-f]{%d}\.arrow' % (2 * FINGERPRINT_DIGEST_BYTES))
+    for old_path in glob.glob(os.path.join(os.path.dirname(cache_path), f"{glob.escape(stem)}-*.arrow")):
+        if old_path != cache_path and stale.fullmatch(os.path.basename(old_path)):
+            os.remove(old_path)
+    
+    return cache_path
+
+def resolve_columns(columns, fields=None):
+    """
+    Map canonical schema fields to the matching column names in `columns`.
+    
+    Fields with no matching column are left out of the result.
+    """
+    if fields is None:
+        fields = list(TWEET_SCHEMA)
+    
+    available = set(columns)
+    resolved = {}
+    for field in fields:
+        aliases, _ = TWEET_SCHEMA[field]
+        for alias in aliases:
+            if alias in available:
+                resolved[field] = alias
+                break
+    return resolved
+
+def apply_schema(df, resolved):
+    """
+    Rename resolved columns to their canonical names and compact their dtypes
+    """
+    df = df.rename(columns={col: field for field, col in resolved.items()})
+    
+    for field in resolved:
+        _, kind = TWEET_SCHEMA[field]
+        if kind == 'category':
+            df[field] = df[field].astype('category')
+        elif kind == 'count':
+            counts = pd.to_numeric(df[field], errors='coerce').fillna(0).clip(lower=0)
+            df[field] = counts.astype(COUNT_DTYPE)
+        elif kind == 'datetime':
+            df[field] = pd.to_datetime(df[field], errors='coerce')
+    
+    return df
+
+def _schema_read_kwargs(file_path, encoding, columns):
+    # Resolve the projection against the header, without parsing any rows
+    header = pd.read_csv(file_path, nrows=0, encoding=encoding, encoding_errors='replace')
+    resolved = resolve_columns(header.columns, columns)
+    
+    dtype = {col: 'category' for field, col in resolved.items()
+             if TWEET_SCHEMA[field][1] == 'category'}
+    return resolved, {'usecols': list(resolved.values()), 'dtype': dtype}
+
+def _projection_tag(columns):
+    key = f"v{SCHEMA_VERSION}:" + ','.join(sorted(columns))
+    return hashlib.blake2b(key.encode(), digest_size=4).hexdigest()
+
+def detect_encoding(file_path, sniff_bytes=ENCODING_SNIFF_BYTES):
+    """
+    Guess the file encoding from a prefix of the file (utf-8 or latin1)
+    """
+    with open(file_path, 'rb') as f:
+        prefix = f.read(sniff_bytes)
+    
+    # Incremental decoder so a multi-byte character cut at the end
+    # of the prefix is not mistaken for invalid utf-8
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(prefix, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin1'
+
+def iter_twitter_chunks(file_path=None, chunksize=DEFAULT_CHUNKSIZE, encoding=None,
+                        columns=None, **read_kwargs):
+    """
+    Stream the Twitter dataset as DataFrames of at most `chunksize` rows.
+    
+    Only one chunk is held in memory at a time, so peak memory is bounded
+    by the chunk size rather than the file size. `columns` projects each
+    chunk onto those TWEET_SCHEMA fields, as in `load_twitter_data`.
+    """
+    if file_path is None:
+        file_path = default_data_path()
+    if encoding is None:
+        encoding = detect_encoding(file_path)
+    
+    resolved = None
+    if columns is not None:
+        resolved, schema_kwargs = _schema_read_kwargs(file_path, encoding, columns)
+        read_kwargs = {**schema_kwargs, **read_kwargs}
+    
+    # Bytes the sniff did not see must not abort the stream half way
+    reader = pd.read_csv(file_path, chunksize=chunksize, encoding=encoding,
+                         encoding_errors='replace', **read_kwargs)
+    with reader:
+        for chunk in reader:
+            yield chunk if resolved is None else apply_schema(chunk, resolved)
+
+def iter_tweet_records(file_path=None, chunksize=DEFAULT_CHUNKSIZE, columns=None, **read_kwargs):
+    """
+    Stream the Twitter dataset one tweet at a time as dicts
+    """
+    for chunk in iter_twitter_chunks(file_path, chunksize=chunksize, columns=columns, **read_kwargs):
+        yield from chunk.to_dict('records')
+
+def load_twitter_data(file_path=None, chunksize=None, use_cache=True, columns=None):
     """
     Load Twitter election dataset
+    
+    When `chunksize` is given, returns an iterator of DataFrame chunks
+    (see `iter_twitter_chunks`) instead of loading the whole file.
+    With `use_cache`, the first full load writes a columnar copy of the
+    CSV and later loads read that copy instead of parsing the text.
+    `columns` (e.g. ANALYSIS_COLUMNS) loads only those TWEET_SCHEMA fields,
+    renamed to their canonical names and stored with compact dtypes.
     """
     print("Starting data loader...")
     
     if file_path is None:
-        # Default path
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir)
-        file_path = os.path.join(project_root, 'data', 'raw', 'election_tweets_sample.csv')
+        file_path = default_data_path()
     
     print(f"Looking for file at: {file_path}")
     print(f"File exists: {os.path.exists(file_path)}")
@@ -23,17 +260,43 @@ def load_twitter_data(file_path=None):
         print("Please check the file path.")
         return None
     
+    tag = _projection_tag(columns) if columns is not None else None
+    
+    if use_cache and chunksize is None:
+        df = read_columnar_cache(file_path, tag=tag)
+        if df is not None:
+            print(f"✅ Loaded {len(df)} tweets from columnar cache")
+            return df
+    
+    # Sniff the encoding once instead of re-parsing the file on failure
+    encoding = detect_encoding(file_path)
+    print(f"Detected encoding: {encoding}")
+    
+    if chunksize is not None:
+        print(f"Streaming in chunks of {chunksize:,} tweets")
+        return iter_twitter_chunks(file_path, chunksize=chunksize, encoding=encoding, columns=columns)
+    
     try:
         print(f"\nAttempting to load CSV file...")
-        # Try different encodings if needed
-        try:
-            df = pd.read_csv(file_path)
-        except UnicodeDecodeError:
-            print("Trying latin1 encoding...")
-            df = pd.read_csv(file_path, encoding='latin1')
+        if columns is None:
+            df = pd.read_csv(file_path, encoding=encoding, encoding_errors='replace')
+        else:
+            resolved, read_kwargs = _schema_read_kwargs(file_path, encoding, columns)
+            print(f"Projected columns: {resolved}")
+            df = pd.read_csv(file_path, encoding=encoding, encoding_errors='replace', **read_kwargs)
+            df = apply_schema(df, resolved)
         
         print(f"✅ Successfully loaded {len(df)} tweets")
         
+        if use_cache:
+            # A failed cache write must not cost us the loaded data
+            try:
+                cache_path = write_columnar_cache(df, file_path, tag=tag)
+                if cache_path is not None:
+                    print(f"Cached columnar copy at: {cache_path}")
+            except Exception as e:
+                print(f"⚠️ Could not write columnar cache: {e}")
+        
         # Show basic info
         print("\n=== DATASET INFO ===")
         print(f"Columns: {list(df.columns)}")
@@ -69,24 +332,22 @@ def explore_data(df):
     
     # Check data types
     print("\nData types (first 10 columns):")
-    for col, dtype in df.dtypes.items()[:10]:
+    for col, dtype in list(df.dtypes.items())[:10]:
         print(f"  {col}: {dtype}")
     
+    resolved = resolve_columns(df.columns, ['user', 'text'])
+    
     # Check unique users
-    user_cols = ['user_name', 'user_screen_name', 'username', 'user']
-    for col in user_cols:
-        if col in df.columns:
-            print(f"\nUnique users in '{col}': {df[col].nunique()}")
-            break
+    if 'user' in resolved:
+        col = resolved['user']
+        print(f"\nUnique users in '{col}': {df[col].nunique()}")
     
     # Show sample of user mentions/retweets
     print("\n=== SAMPLE TEXTS (first 2) ===")
-    text_cols = ['text', 'tweet', 'content']
-    for col in text_cols:
-        if col in df.columns:
-            for i in range(min(2, len(df))):
-                print(f"\nTweet {i+1}: {df[col].iloc[i][:100]}...")
-            break
+    if 'text' in resolved:
+        col = resolved['text']
+        for i in range(min(2, len(df))):
+            print(f"\nTweet {i+1}: {df[col].iloc[i][:100]}...")
 
 if __name__ == "__main__":
     print("=" * 50)
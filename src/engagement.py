@@ -0,0 +1,236 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+# Centroid budget of the quantile sketch; larger is more accurate
+DEFAULT_COMPRESSION = 200
+
+# Tweets at or above this engagement quantile count as viral
+VIRAL_QUANTILE = 0.95
+
+# Log-spaced engagement histogram: 8 bins per decade from 1 to 10^8
+HISTOGRAM_EDGES = np.logspace(0, 8, 65)
+
+# Engagement below this is counted per exact value, so the share of
+# tweets at or above a threshold in that range is exact, ties included
+EXACT_ENGAGEMENT_VALUES = 1 << 16
+
+class TDigest:
+    """
+    Merging t-digest: a constant-size sketch of a stream of values that
+    answers quantile and CDF queries, most precisely in the tails.
+
+    Values are buffered and folded into at most ~`compression` weighted
+    centroids in vectorized batches. Digests of separate streams can be
+    combined with `merge`.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def count(self):
+        self._flush()
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values):
+            self._buffer.append(values)
+            self._buffered += len(values)
+            if self._buffered >= 10 * self.compression:
+                self._flush()
+        return self
+
+    def merge(self, other):
+        other._flush()
+        self._flush()
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        values = np.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # The arcsine scale function gives each centroid a k-range of one,
+        # so centroids stay small near q = 0 and q = 1
+        q_mid = (weights.cumsum() - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        group = np.floor(k)
+        starts = np.flatnonzero(np.concatenate(([True], group[1:] != group[:-1])))
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def _knots(self):
+        # Centroid means placed at the cumulative weight of their middle
+        self._flush()
+        total = self.weights.sum()
+        return self.means, (self.weights.cumsum() - self.weights / 2) / total
+
+    def quantile(self, q):
+        """
+        Estimated value at quantile(s) `q` in [0, 1]
+        """
+        if not len(self.means) and not self._buffered:
+            return np.nan
+        means, positions = self._knots()
+        return np.interp(q, positions, means)
+
+    def cdf(self, x):
+        """
+        Estimated fraction of values at or below `x`
+        """
+        if not len(self.means) and not self._buffered:
+            return np.nan
+        means, positions = self._knots()
+        return np.interp(x, means, positions, left=0.0, right=1.0)
+
+class EngagementStats:
+    """
+    Single-pass engagement accumulator for the Viral Content view.
+
+    Feed it tweet chunks with `update`; memory stays constant however many
+    tweets pass through: running sums, a t-digest of engagement, a
+    log-binned histogram, counts of every engagement value below
+    EXACT_ENGAGEMENT_VALUES and a bounded min-heap of the k most engaging
+    tweets.
+    """
+
+    def __init__(self, k=5, compression=DEFAULT_COMPRESSION):
+        self.k = k
+        self.n_tweets = 0
+        self.total_likes = 0.0
+        self.total_retweets = 0.0
+        self.digest = TDigest(compression)
+        self.zero_engagement = 0
+        self.histogram = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64)
+        self.value_counts = np.zeros(EXACT_ENGAGEMENT_VALUES, dtype=np.int64)
+        self._top = []
+        self._seen = 0
+
+    def update(self, chunk):
+        likes = _counts(chunk, 'likes')
+        retweets = _counts(chunk, 'retweets')
+        engagement = likes + retweets
+
+        self.n_tweets += len(chunk)
+        self.total_likes += likes.sum()
+        self.total_retweets += retweets.sum()
+        self.digest.update(engagement)
+
+        positive = engagement[engagement > 0]
+        self.zero_engagement += len(engagement) - len(positive)
+        bins = np.searchsorted(HISTOGRAM_EDGES, positive, side='right') - 1
+        self.histogram += np.bincount(np.clip(bins, 0, len(self.histogram) - 1),
+                                      minlength=len(self.histogram))
+        small = engagement[engagement < EXACT_ENGAGEMENT_VALUES]
+        self.value_counts += np.bincount(small.astype(np.int64), minlength=EXACT_ENGAGEMENT_VALUES)
+
+        # Only the chunk's own top k can enter the heap
+        candidates = np.argsort(-engagement, kind='stable')[:self.k]
+        for i in candidates:
+            entry = (engagement[i], -(self._seen + i), _tweet_record(chunk, i, likes, retweets))
+            if len(self._top) < self.k:
+                heapq.heappush(self._top, entry)
+            elif entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, entry)
+            else:
+                break
+        self._seen += len(chunk)
+        return self
+
+    def top_tweets(self):
+        """
+        The k most engaging tweets seen so far, most engaging first
+        """
+        rows = [record for _, _, record in sorted(self._top, key=lambda e: e[:2], reverse=True)]
+        return pd.DataFrame(rows, columns=['tweet_id', 'user', 'text', 'likes', 'retweets', 'engagement'])
+
+    def viral_threshold(self, quantile=VIRAL_QUANTILE):
+        """
+        Engagement at the given quantile of the tweets seen so far
+        """
+        return float(self.digest.quantile(quantile)) if self.n_tweets else 0.0
+
+    def share_at_least(self, threshold):
+        """
+        Fraction of the tweets seen so far with engagement >= `threshold`.
+
+        Engagement is a whole count, so below EXACT_ENGAGEMENT_VALUES the
+        answer comes from the exact value counts; above it the digest's
+        CDF estimates the tail.
+        """
+        if not self.n_tweets:
+            return 0.0
+        cutoff = int(np.ceil(threshold))
+        if cutoff <= EXACT_ENGAGEMENT_VALUES:
+            below = int(self.value_counts[:max(cutoff, 0)].sum())
+            return (self.n_tweets - below) / self.n_tweets
+        return 1.0 - float(self.digest.cdf(threshold))
+
+    def summary(self, quantile=VIRAL_QUANTILE):
+        """
+        Engagement artifact: averages, viral threshold and rate, the top
+        tweets and the engagement histogram
+        """
+        n = max(self.n_tweets, 1)
+        threshold = self.viral_threshold(quantile)
+        return {
+            'tweets': self.n_tweets,
+            'average_likes': float(self.total_likes / n),
+            'average_retweets': float(self.total_retweets / n),
+            'average_engagement': float((self.total_likes + self.total_retweets) / n),
+            'median_engagement': float(self.digest.quantile(0.5)) if self.n_tweets else 0.0,
+            'viral_quantile': quantile,
+            'viral_threshold': threshold,
+            'viral_rate': self.share_at_least(threshold),
+            'top_tweets': self.top_tweets(),
+            'histogram_edges': HISTOGRAM_EDGES,
+            'histogram': self.histogram.copy(),
+            'zero_engagement': self.zero_engagement,
+        }
+
+def _counts(chunk, column):
+    if column not in chunk.columns:
+        return np.zeros(len(chunk))
+    return pd.to_numeric(chunk[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+def _tweet_record(chunk, i, likes, retweets):
+    row = chunk.iloc[i]
+    return {
+        'tweet_id': row.get('tweet_id'),
+        'user': row.get('user'),
+        'text': row.get('text'),
+        'likes': int(likes[i]),
+        'retweets': int(retweets[i]),
+        'engagement': int(likes[i] + retweets[i]),
+    }
+
+def engagement_stats(chunks, k=5, quantile=VIRAL_QUANTILE, compression=DEFAULT_COMPRESSION):
+    """
+    Engagement summary of an iterable of tweet DataFrames in one pass.
+
+    Pass `iter_twitter_chunks(columns=ANALYSIS_COLUMNS)` to stream a file
+    of any size, or `[df]` for a frame already in memory.
+    """
+    stats = EngagementStats(k, compression)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats.summary(quantile)
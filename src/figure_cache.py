@@ -0,0 +1,73 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+# Total size of the PNGs kept by a FigureCache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Resolution of downloaded figures
+DOWNLOAD_DPI = 150
+
+def figure_spec_hash(*spec):
+    """
+    Cache key for a figure: hash of everything that determines its content,
+    e.g. the view, dataset fingerprint and widget values
+    """
+    return hashlib.blake2b(repr(spec).encode('utf-8'), digest_size=16).hexdigest()
+
+def figure_png(fig, dpi=DOWNLOAD_DPI):
+    """
+    PNG bytes of a matplotlib figure
+    """
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches='tight')
+    return buf.getvalue()
+
+class FigureCache:
+    """
+    Rendered figure bytes keyed by figure spec hash.
+
+    Least recently used entries are evicted once the cached bytes exceed
+    `max_bytes`. Safe to share between threads, since downloads are
+    generated outside the script run.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= len(self._entries.pop(key))
+            # A figure larger than the whole budget is not kept
+            if len(data) > self.max_bytes:
+                return data
+            self._entries[key] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+        return data
+
+    def get_or_render(self, key, render):
+        """
+        Cached bytes for `key`, calling `render()` only on a miss
+        """
+        data = self.get(key)
+        if data is None:
+            data = self.put(key, render())
+        return data
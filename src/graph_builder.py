@@ -0,0 +1,310 @@
+import re
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+# Twitter handles are 1-15 word characters
+MENTION_PATTERN = re.compile(r'@(\w{1,15})')
+
+# Retweets start with "RT @original_author"
+RETWEET_PATTERN = re.compile(r'RT\s+@')
+
+# User IDs and edge weights are stored compactly: 8 bytes per CSR edge
+NODE_DTYPE = np.int32
+WEIGHT_DTYPE = np.float32
+
+class HandleInterner:
+    """
+    Maps user handles to contiguous integer IDs in order of first appearance.
+
+    `handles[i]` is the handle of ID i. Interning a batch of handles only
+    touches a Python dict once per distinct new handle.
+    """
+
+    def __init__(self, handles=()):
+        self.handles = []
+        self._ids = {}
+        if len(handles):
+            self.intern(handles)
+
+    def __len__(self):
+        return len(self.handles)
+
+    def intern(self, values):
+        """
+        IDs of the given handles, assigning new IDs to unseen ones
+        """
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        ids = np.empty(len(uniques), dtype=NODE_DTYPE)
+        for i, handle in enumerate(uniques):
+            ids[i] = self._ids.setdefault(handle, len(self._ids))
+            if ids[i] == len(self.handles):
+                self.handles.append(handle)
+        return ids[codes]
+
+    def lookup(self, values):
+        """
+        IDs of the given handles, -1 for handles never interned
+        """
+        return np.fromiter((self._ids.get(h, -1) for h in values), dtype=NODE_DTYPE, count=len(values))
+
+class EdgeList:
+    """
+    Mention edges as parallel NumPy arrays: source and target user IDs,
+    weight and (optionally) the tweet timestamp of every edge.
+    """
+
+    def __init__(self, src, dst, weight=None, timestamp=None):
+        self.src = np.asarray(src, dtype=NODE_DTYPE)
+        self.dst = np.asarray(dst, dtype=NODE_DTYPE)
+        self.weight = (np.ones(len(self.src), dtype=WEIGHT_DTYPE) if weight is None
+                       else np.asarray(weight, dtype=WEIGHT_DTYPE))
+        self.timestamp = None if timestamp is None else np.asarray(timestamp, dtype='datetime64[ns]')
+
+    def __len__(self):
+        return len(self.src)
+
+    @property
+    def nbytes(self):
+        arrays = [self.src, self.dst, self.weight] + ([self.timestamp] if self.timestamp is not None else [])
+        return sum(a.nbytes for a in arrays)
+
+    @classmethod
+    def from_interactions(cls, interactions, interner):
+        """
+        Intern the handles of `extract_interactions` rows into an EdgeList
+        """
+        n = len(interactions)
+        ids = interner.intern(np.concatenate([interactions['source'].to_numpy(dtype=object),
+                                              interactions['target'].to_numpy(dtype=object)]))
+        timestamp = None
+        if 'timestamp' in interactions:
+            timestamp = pd.to_datetime(interactions['timestamp'], errors='coerce').to_numpy()
+        return cls(ids[:n], ids[n:], timestamp=timestamp)
+
+    def to_csr(self, n_nodes):
+        """
+        n_nodes x n_nodes CSR adjacency, summing repeated pairs into weights
+        """
+        adjacency = sp.coo_matrix((self.weight, (self.src, self.dst)), shape=(n_nodes, n_nodes))
+        return compact_csr(adjacency)
+
+def compact_csr(adjacency):
+    """
+    CSR matrix with int32 indices and float32 weights, duplicates summed
+    """
+    if (sp.isspmatrix_csr(adjacency) and adjacency.dtype == WEIGHT_DTYPE
+            and adjacency.indices.dtype == NODE_DTYPE and adjacency.has_canonical_format):
+        return adjacency
+    csr = sp.csr_matrix(adjacency, dtype=WEIGHT_DTYPE)
+    csr.sum_duplicates()
+    csr.indices = csr.indices.astype(NODE_DTYPE, copy=False)
+    csr.indptr = csr.indptr.astype(np.int64 if csr.nnz > np.iinfo(NODE_DTYPE).max else NODE_DTYPE,
+                                   copy=False)
+    return csr
+
+def row_positions(indptr, rows):
+    """
+    Positions in a CSR matrix's `indices` / `data` of every entry of the
+    given rows, row after row, and the number of entries of each row.
+
+    `indices[positions]` are then the neighbours of all `rows` at once,
+    and `np.repeat(rows, counts)` the row each of them came from.
+    """
+    starts, ends = indptr[rows], indptr[rows + 1]
+    counts = ends - starts
+    return np.repeat(ends - counts.cumsum(), counts) + np.arange(counts.sum()), counts
+
+class MentionGraph:
+    """
+    Directed, weighted user-mention graph stored as a CSR adjacency.
+
+    Row i / column j of `adjacency` is the user `handles[i]` / `handles[j]`,
+    and the entry is how many times i mentioned (or retweeted) j. The
+    CSC view (incoming edges) and the handle index are built on first use
+    and then shared by every algorithm. `handles` may also be a lazy
+    table (see `graph_store.HandleTable`), decoded on first access.
+    """
+
+    def __init__(self, adjacency, handles):
+        self.adjacency = compact_csr(adjacency)
+        self._handles = handles
+        self._csc = None
+        self._interner = None
+
+    def __getstate__(self):
+        # Derived views are rebuilt on demand rather than stored
+        state = self.__dict__.copy()
+        state['_handles'] = self.handles
+        state['_csc'] = state['_interner'] = None
+        return state
+
+    def __setstate__(self, state):
+        # Graphs pickled before handles became lazy stored them directly
+        if 'handles' in state:
+            state['_handles'] = state.pop('handles')
+        self.__dict__.update(state)
+        self._csc = self._interner = None
+
+    @property
+    def handles(self):
+        if not (isinstance(self._handles, np.ndarray) and self._handles.dtype == object):
+            self._handles = np.asarray(self._handles, dtype=object)
+        return self._handles
+
+    @property
+    def n_nodes(self):
+        return self.adjacency.shape[0]
+
+    @property
+    def n_edges(self):
+        return self.adjacency.nnz
+
+    @property
+    def csc(self):
+        """
+        The adjacency in CSC layout: column j lists the users mentioning j
+        """
+        if self._csc is None:
+            self._csc = self.adjacency.tocsc()
+        return self._csc
+
+    def out_degree(self):
+        return np.diff(self.adjacency.indptr)
+
+    def in_degree(self):
+        return np.diff(self.csc.indptr)
+
+    def node_ids(self, handles):
+        """
+        Node indices of the given handles, -1 for users not in the graph
+        """
+        if self._interner is None:
+            self._interner = HandleInterner(self.handles)
+        return self._interner.lookup(handles)
+
+    def edges(self):
+        """
+        EdgeList view of the CSR arrays (targets and weights are not copied)
+        """
+        src = np.repeat(np.arange(self.n_nodes, dtype=NODE_DTYPE), self.out_degree())
+        return EdgeList(src, self.adjacency.indices, self.adjacency.data)
+
+    def subgraph(self, nodes):
+        """
+        Induced subgraph on the given node indices
+        """
+        nodes = np.asarray(nodes)
+        return MentionGraph(self.adjacency[nodes][:, nodes], self.handles[nodes])
+
+    def to_scipy(self):
+        """
+        The CSR adjacency itself, for scipy.sparse algorithms (no copy)
+        """
+        return self.adjacency
+
+    def to_networkx(self, nodes=None):
+        """
+        networkx DiGraph with handles as node names and `weight` on edges.
+
+        networkx stores dicts per edge, so only convert the part of the
+        graph an algorithm needs by passing its `nodes`.
+        """
+        import networkx as nx
+
+        graph = self if nodes is None else self.subgraph(nodes)
+        edges = graph.edges()
+        G = nx.DiGraph()
+        G.add_nodes_from(graph.handles)
+        G.add_weighted_edges_from(zip(graph.handles[edges.src], graph.handles[edges.dst],
+                                      edges.weight.tolist()))
+        return G
+
+def normalize_handles(users):
+    """
+    Lower-case handles without a leading '@', keeping missing values as NA
+    """
+    return users.astype('string').str.lower().str.lstrip('@')
+
+def extract_interactions(df, text_col='text', user_col='user', time_col=None):
+    """
+    Extract (source, target, is_retweet) rows for every @mention in the tweets
+
+    With `time_col`, each row also carries the tweet's `timestamp`.
+    """
+    text = df[text_col].fillna('').astype(str).reset_index(drop=True)
+    authors = normalize_handles(df[user_col]).reset_index(drop=True)
+
+    # One regex pass over all tweets; explode keeps the tweet row as index
+    handles = text.str.findall(MENTION_PATTERN).explode().dropna()
+    rows = handles.index.to_numpy()
+
+    # The first mention of a retweet is the account being retweeted
+    is_retweet = text.str.match(RETWEET_PATTERN).to_numpy()[rows] & ~handles.index.duplicated()
+
+    interactions = pd.DataFrame({
+        'source': authors.to_numpy(dtype=object)[rows],
+        'target': handles.str.lower().to_numpy(dtype=object),
+        'is_retweet': is_retweet,
+    })
+    if time_col is not None:
+        interactions['timestamp'] = df[time_col].to_numpy()[rows]
+
+    # Tweets without an author and users mentioning themselves carry
+    # no information about influence
+    keep = interactions['source'].notna() & (interactions['source'] != interactions['target'])
+    return interactions[keep].reset_index(drop=True)
+
+def build_mention_graph(df, text_col='text', user_col='user', include_retweets=True,
+                        include_isolates=True):
+    """
+    Build the directed, weighted mention graph from a tweets DataFrame.
+
+    Users are interned to contiguous int32 IDs, and repeated mentions
+    between the same pair are summed into the edge weight.
+    """
+    interactions = extract_interactions(df, text_col, user_col)
+    if not include_retweets:
+        interactions = interactions[~interactions['is_retweet']]
+
+    interner = HandleInterner()
+    edges = EdgeList.from_interactions(interactions, interner)
+    if include_isolates:
+        # Authors who never mention anyone are still users in the network
+        interner.intern(normalize_handles(df[user_col]).dropna().to_numpy(dtype=object))
+
+    return MentionGraph(edges.to_csr(len(interner)), interner.handles)
+
+def compute_network_metrics(graph):
+    """
+    Summary statistics shown in the Network Construction view
+    """
+    n = graph.n_nodes
+    m = graph.n_edges
+    n_components, _ = connected_components(graph.adjacency, directed=True, connection='weak')
+
+    return {
+        "Total Nodes (Users)": n,
+        "Total Edges (Mentions)": m,
+        "Total Mentions": int(graph.adjacency.sum()),
+        "Network Density": m / (n * (n - 1)) if n > 1 else 0.0,
+        "Average Degree": 2 * m / n if n else 0.0,
+        "Connected Components": n_components,
+    }
+
+def largest_component_nodes(graph):
+    """
+    Node indices of the largest weakly connected component
+    """
+    _, labels = connected_components(graph.adjacency, directed=True, connection='weak')
+    return np.flatnonzero(labels == np.bincount(labels).argmax())
+
+def top_degree_nodes(graph, k):
+    """
+    Indices of the k nodes with the highest total degree
+    """
+    degree = graph.in_degree() + graph.out_degree()
+    k = min(k, graph.n_nodes)
+    return np.argsort(-degree, kind='stable')[:k]
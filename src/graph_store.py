@@ -0,0 +1,132 @@
+import os
+import struct
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.artifact_store import default_artifact_dir
+from src.graph_builder import NODE_DTYPE, WEIGHT_DTYPE, MentionGraph
+
+# Bump when the file layout changes so stale graph files are rebuilt
+GRAPH_FORMAT_VERSION = 1
+
+GRAPH_MAGIC = b'MENTIONG'
+
+# magic, version, indptr item size, n_nodes, n_edges, then the byte
+# offsets of the handle offsets, handle bytes, indptr, indices and weights
+HEADER = struct.Struct('<8sIIqq5q')
+
+# Sections start on 8-byte boundaries so every array view is aligned
+SECTION_ALIGNMENT = 8
+
+class HandleTable:
+    """
+    Read-only ID -> handle table over a memory-mapped UTF-8 string table.
+
+    Handle i is `data[offsets[i]:offsets[i + 1]]`. Single handles are
+    decoded on access; converting to an array decodes them all.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, key):
+        if np.ndim(key) == 0 and not isinstance(key, slice):
+            start, end = self.offsets[key], self.offsets[key + 1]
+            return bytes(self.data[start:end]).decode('utf-8')
+        ids = np.arange(len(self))[key]
+        return np.array([self[i] for i in ids], dtype=object)
+
+    def __array__(self, dtype=None, copy=None):
+        blob = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        handles = np.empty(len(self), dtype=object)
+        handles[:] = [blob[a:b].decode('utf-8') for a, b in zip(bounds[:-1], bounds[1:])]
+        return handles
+
+def default_graph_path(fingerprint, artifact_dir=None):
+    """
+    Location of the mention graph file built from the input with this fingerprint
+    """
+    if artifact_dir is None:
+        artifact_dir = default_artifact_dir()
+    return os.path.join(artifact_dir, f"mention-graph-v{GRAPH_FORMAT_VERSION}-{fingerprint}.mgraph")
+
+def _aligned(offset):
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+def save_graph(graph, path):
+    """
+    Write a MentionGraph in the binary graph format
+    """
+    A = graph.adjacency
+    encoded = [str(handle).encode('utf-8') for handle in graph.handles]
+    handle_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    handle_offsets[1:] = np.cumsum([len(h) for h in encoded])
+    sections = [
+        handle_offsets,
+        np.frombuffer(b''.join(encoded), dtype=np.uint8),
+        np.ascontiguousarray(A.indptr),
+        np.ascontiguousarray(A.indices, dtype=NODE_DTYPE),
+        np.ascontiguousarray(A.data, dtype=WEIGHT_DTYPE),
+    ]
+
+    offsets = []
+    position = HEADER.size
+    for array in sections:
+        position = _aligned(position)
+        offsets.append(position)
+        position += array.nbytes
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    header = HEADER.pack(GRAPH_MAGIC, GRAPH_FORMAT_VERSION, A.indptr.dtype.itemsize,
+                         graph.n_nodes, graph.n_edges, *offsets)
+
+    # Write to a temp file first so readers never map a partial graph
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for offset, array in zip(offsets, sections):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def open_graph(path):
+    """
+    Memory-map a graph file as a MentionGraph, or None if it is missing or stale.
+
+    Only the header is read: the CSR arrays are views of the mapping, so
+    pages are loaded lazily and shared by every process that opens the
+    same file, and handles are decoded on first use.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        return None
+    magic, version, indptr_size, n_nodes, n_edges, *offsets = HEADER.unpack(raw)
+    if magic != GRAPH_MAGIC or version != GRAPH_FORMAT_VERSION:
+        return None
+
+    buf = np.memmap(path, dtype=np.uint8, mode='r')
+    handle_offsets_at, handles_at, indptr_at, indices_at, weights_at = offsets
+    indptr_dtype = np.dtype(np.int64 if indptr_size == 8 else np.int32)
+
+    def section(start, dtype, count):
+        return buf[start:start + count * np.dtype(dtype).itemsize].view(dtype)
+
+    handle_offsets = section(handle_offsets_at, np.int64, n_nodes + 1)
+    handles = HandleTable(handle_offsets, section(handles_at, np.uint8, int(handle_offsets[-1])))
+    adjacency = sp.csr_matrix((section(weights_at, WEIGHT_DTYPE, n_edges),
+                               section(indices_at, NODE_DTYPE, n_edges),
+                               section(indptr_at, indptr_dtype, n_nodes + 1)),
+                              shape=(n_nodes, n_nodes), copy=False)
+    # Saved graphs are canonical; marking them so skips a scan over every edge
+    adjacency.has_canonical_format = True
+    return MentionGraph(adjacency, handles)
@@ -0,0 +1,225 @@
+import re
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Hashtags are '#' followed by word characters
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+
+# Categories shown in the Hashtag view
+HASHTAG_CATEGORIES = ('Republican', 'Democrat', 'Process', 'Media', 'Issues')
+
+# Hand-labelled seed hashtags for each category
+KNOWN_HASHTAG_CATEGORIES = {
+    'trump': 'Republican', 'maga': 'Republican', 'trump2020': 'Republican',
+    'republican': 'Republican', 'kag': 'Republican',
+    'biden': 'Democrat', 'bidenharris2020': 'Democrat', 'democrat': 'Democrat',
+    'joebiden': 'Democrat', 'kamalaharris': 'Democrat',
+    'election2020': 'Process', 'vote': 'Process', 'useelection2020': 'Process',
+    'electionday': 'Process', 'voteearly': 'Process',
+    'foxnews': 'Media', 'cnn': 'Media', 'msnbc': 'Media', 'nypost': 'Media',
+    'covid': 'Issues', 'economy': 'Issues', 'blacklivesmatter': 'Issues',
+    'covid19': 'Issues', 'healthcare': 'Issues',
+}
+
+class HashtagGraph:
+    """
+    Undirected, weighted hashtag co-occurrence graph stored as a CSR adjacency.
+
+    Row/column i is the tag `tags[i]` (lower-case, without '#'), used in
+    `counts[i]` tweets. Entries are co-occurrence counts, or PMI / lift
+    when the graph was built with a weighting.
+    """
+
+    def __init__(self, adjacency, tags, counts, n_tweets, weighting='count'):
+        self.adjacency = adjacency.tocsr()
+        self.tags = np.asarray(tags, dtype=object)
+        self.counts = np.asarray(counts)
+        self.n_tweets = n_tweets
+        self.weighting = weighting
+
+    @property
+    def n_tags(self):
+        return self.adjacency.shape[0]
+
+    @property
+    def n_edges(self):
+        return self.adjacency.nnz // 2
+
+    def top_tags(self, k):
+        """
+        Indices of the k most used tags
+        """
+        k = min(k, self.n_tags)
+        return np.argsort(-self.counts, kind='stable')[:k]
+
+    def subgraph(self, nodes):
+        """
+        Induced subgraph on the given tag indices
+        """
+        nodes = np.asarray(nodes)
+        return HashtagGraph(self.adjacency[nodes][:, nodes], self.tags[nodes], self.counts[nodes],
+                            self.n_tweets, self.weighting)
+
+def hashtag_incidence(df, text_col='text', min_count=1):
+    """
+    Sparse tweet x tag incidence matrix and the interned tags.
+
+    All tweets go through one regex pass; each tag counts once per tweet.
+    Tags used in fewer than `min_count` tweets are dropped.
+    """
+    text = df[text_col].fillna('').astype(str).reset_index(drop=True)
+    tags = text.str.findall(HASHTAG_PATTERN).explode().dropna().str.lower()
+    rows = tags.index.to_numpy()
+
+    codes, names = pd.factorize(tags.to_numpy(dtype=object))
+    incidence = sp.coo_matrix((np.ones(len(codes), dtype=np.float32), (rows, codes)),
+                              shape=(len(text), len(names))).tocsr()
+    # Repeated tags within a tweet were summed; count them once
+    incidence.data[:] = 1
+
+    counts = np.diff(incidence.tocsc().indptr)
+    keep = np.flatnonzero(counts >= min_count)
+    if len(keep) < len(names):
+        incidence = incidence[:, keep]
+        names = names[keep]
+    return incidence, np.asarray(names, dtype=object)
+
+def prune_top_k(adjacency, k):
+    """
+    Keep each node's k heaviest edges (an edge survives if either end keeps it)
+    """
+    coo = adjacency.tocoo()
+    order = np.lexsort((-coo.data, coo.row))
+    row = coo.row[order]
+
+    # Rank of each edge within its row, heaviest first
+    starts = np.searchsorted(row, row, side='left')
+    keep = order[np.arange(len(order)) - starts < k]
+
+    kept = sp.csr_matrix((coo.data[keep], (coo.row[keep], coo.col[keep])), shape=adjacency.shape)
+    return kept.maximum(kept.T).tocsr()
+
+def reweight(graph, weighting):
+    """
+    Copy of a count-weighted hashtag graph with 'count', 'pmi' (positive
+    pointwise mutual information) or 'lift' edge weights
+    """
+    if graph.weighting != 'count':
+        raise ValueError("Only count-weighted hashtag graphs can be reweighted")
+    if weighting == 'count':
+        return graph
+
+    coo = graph.adjacency.tocoo()
+    counts = graph.counts
+    lift = coo.data * graph.n_tweets / (counts[coo.row] * counts[coo.col]).astype(np.float64)
+    if weighting == 'lift':
+        weights = lift
+    elif weighting == 'pmi':
+        # Tags co-occurring less than chance get no edge
+        weights = np.maximum(np.log(lift), 0.0)
+    else:
+        raise ValueError(f"Unknown co-occurrence weighting: {weighting}")
+
+    adjacency = sp.csr_matrix((weights.astype(np.float32), (coo.row, coo.col)), shape=coo.shape)
+    adjacency.eliminate_zeros()
+    return HashtagGraph(adjacency, graph.tags, counts, graph.n_tweets, weighting)
+
+def build_hashtag_graph(df, text_col='text', weighting='count', top_k=None, min_count=1):
+    """
+    Build the hashtag co-occurrence graph from a tweets DataFrame.
+
+    Co-occurrence counts are the sparse product X^T X of the tweet x tag
+    incidence matrix X; its diagonal is the number of tweets per tag.
+    `top_k` keeps only each tag's k strongest links after weighting.
+    """
+    incidence, tags = hashtag_incidence(df, text_col, min_count)
+
+    cooccurrence = (incidence.T @ incidence).tocsr()
+    counts = cooccurrence.diagonal().astype(np.int64)
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+
+    graph = reweight(HashtagGraph(cooccurrence, tags, counts, incidence.shape[0]), weighting)
+    if top_k is not None:
+        graph.adjacency = prune_top_k(graph.adjacency, top_k)
+    return graph
+
+def top_cooccurrences(graph, nodes=None, k=10):
+    """
+    The k heaviest co-occurrence edges as a DataFrame of tag pairs,
+    optionally restricted to edges between the given tag indices
+    """
+    adjacency = graph.adjacency
+    if nodes is not None:
+        nodes = np.asarray(nodes)
+        adjacency = adjacency[nodes][:, nodes]
+    upper = sp.triu(adjacency).tocoo()
+    best = np.argsort(-upper.data, kind='stable')[:k]
+
+    row, col = upper.row[best], upper.col[best]
+    if nodes is not None:
+        row, col = nodes[row], nodes[col]
+    return pd.DataFrame({
+        'source': row,
+        'target': col,
+        'tag1': graph.tags[row],
+        'tag2': graph.tags[col],
+        'weight': upper.data[best],
+    })
+
+def classify_hashtags(graph, seeds=None, alpha=0.85, tol=1e-6, max_iter=100, default='Unclassified'):
+    """
+    Category of every tag by label propagation from hand-labelled seeds.
+
+    Each category's score vector spreads over the row-normalised
+    co-occurrence graph; all categories are updated together as one
+    sparse matrix times dense (n_tags x n_categories) product per step,
+    F <- alpha * P F + (1 - alpha) * Y, with seed tags clamped to their label.
+    Tags the seeds never reach are `default`.
+
+    Returns a dict with the 'categories', the per-tag 'labels', their
+    'confidence' (share of the winning category's score) and whether the
+    tag was a 'seed'.
+    """
+    if seeds is None:
+        seeds = KNOWN_HASHTAG_CATEGORIES
+    categories = list(HASHTAG_CATEGORIES)
+    category_index = {c: i for i, c in enumerate(categories)}
+
+    seed_labels = pd.Series(graph.tags).map(seeds).map(category_index)
+    is_seed = seed_labels.notna().to_numpy()
+    seed_rows = np.flatnonzero(is_seed)
+    seed_cols = seed_labels.to_numpy()[is_seed].astype(np.int64)
+
+    Y = np.zeros((graph.n_tags, len(categories)))
+    Y[seed_rows, seed_cols] = 1.0
+
+    # Row-normalised transition matrix, built once
+    strength = np.asarray(graph.adjacency.sum(axis=1)).ravel()
+    inverse = np.divide(1.0, strength, out=np.zeros_like(strength, dtype=np.float64), where=strength > 0)
+    P = sp.diags(inverse) @ graph.adjacency
+
+    F = Y.copy()
+    for _ in range(max_iter):
+        updated = alpha * (P @ F) + (1 - alpha) * Y
+        updated[seed_rows] = Y[seed_rows]
+        delta = np.abs(updated - F).sum()
+        F = updated
+        if delta < tol:
+            break
+
+    total = F.sum(axis=1)
+    best = F.argmax(axis=1)
+    reached = total > 0
+    labels = np.full(graph.n_tags, default, dtype=object)
+    labels[reached] = np.asarray(categories, dtype=object)[best[reached]]
+    confidence = np.divide(F.max(axis=1), total, out=np.zeros(graph.n_tags), where=reached)
+
+    return {
+        'categories': categories,
+        'labels': labels,
+        'confidence': confidence,
+        'seed': is_seed,
+    }
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from src.graph_builder import normalize_handles
+
+# Features combined into the composite score and their display names
+INFLUENCE_FEATURES = {
+    'mentions_received': 'Mentions Received',
+    'mentions_made': 'Activity Level',
+    'pagerank': 'Network Position',
+    'bridge_score': 'Community Bridge',
+    'engagement': 'Content Engagement',
+}
+
+def percentile_rank(values):
+    """
+    Share of the other users with a strictly smaller value, in [0, 1].
+
+    Tied users share the lowest rank of their group, so users with no
+    activity at all stay at 0 instead of the middle of the scale.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n < 2:
+        return np.zeros(n)
+    below = np.searchsorted(np.sort(values), values, side='left')
+    return below / (n - 1)
+
+def user_engagement(df, graph, user_col='user'):
+    """
+    Likes plus retweets of every graph user's own tweets
+    """
+    likes = pd.to_numeric(df['likes'], errors='coerce') if 'likes' in df else 0
+    retweets = pd.to_numeric(df['retweets'], errors='coerce') if 'retweets' in df else 0
+    engagement = pd.Series(likes + retweets, index=df.index, dtype=np.float64).fillna(0.0)
+    per_user = engagement.groupby(normalize_handles(df[user_col])).sum()
+
+    ids = graph.node_ids(per_user.index.to_numpy(dtype=object))
+    known = ids >= 0
+    return np.bincount(ids[known], weights=per_user.to_numpy()[known], minlength=graph.n_nodes)
+
+def influence_table(graph, centralities, bridges, df, weights=None):
+    """
+    Per-user feature table behind the composite influence score.
+
+    Each feature in INFLUENCE_FEATURES is turned into a percentile rank
+    with one sort, and `influence_score` is their weighted mean scaled to
+    0-100 (equal weights by default). The table is indexed by handle, so
+    a user's profile is a single lookup, and sorted by score.
+    """
+    features = pd.DataFrame({
+        'mentions_received': centralities['mentions_received'].to_numpy(),
+        'mentions_made': centralities['mentions_made'].to_numpy(),
+        'pagerank': centralities['pagerank'].to_numpy(),
+        'bridge_score': bridges['bridge_score'].sort_index().to_numpy(),
+        'engagement': user_engagement(df, graph),
+    }, index=pd.Index(graph.handles, name='user'))
+
+    if weights is None:
+        weights = {name: 1.0 for name in INFLUENCE_FEATURES}
+    total_weight = sum(weights.values())
+
+    score = np.zeros(len(features))
+    for name in INFLUENCE_FEATURES:
+        features[f'{name}_pct'] = percentile_rank(features[name])
+        score += weights.get(name, 0.0) * features[f'{name}_pct'].to_numpy()
+
+    features['influence_score'] = 100 * score / total_weight if total_weight else 0.0
+    features = features.sort_values('influence_score', ascending=False, kind='stable')
+    features['influence_rank'] = np.arange(1, len(features) + 1)
+    return features
+
+def influence_profile(table, user):
+    """
+    Percentile of every feature for one user, keyed by display name
+    """
+    row = table.loc[user]
+    return pd.Series({label: row[f'{name}_pct'] for name, label in INFLUENCE_FEATURES.items()})
+
+def sorted_handles(table):
+    """
+    Handles of the influence table in lexicographic order, for `find_users`
+    """
+    return np.sort(table.index.to_numpy(dtype=str))
+
+def find_users(table, handles, query, k=50):
+    """
+    The user whose handle is `query`, or else up to k users whose handle
+    starts with it, highest score first.
+
+    `handles` is the table's `sorted_handles`; the prefix range is found
+    by binary search, so a lookup never scans every user.
+    """
+    if query in table.index:
+        return [query]
+    start = np.searchsorted(handles, query, side='left')
+    stop = np.searchsorted(handles, query + '\uffff', side='left')
+    matches = handles[start:min(stop, start + k)]
+    return table.loc[matches].sort_values('influence_rank').index.tolist()
+
+def top_influencers(table, k=10):
+    """
+    The k users with the highest composite influence score
+    """
+    return table.head(k)
@@ -0,0 +1,264 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.graph_builder import row_positions
+
+# Algorithms offered by the layout service
+LAYOUT_ALGORITHMS = ('forceatlas2', 'circular', 'random')
+
+# Below this many nodes repulsion is computed exactly, above it with the
+# Barnes-Hut grid approximation
+EXACT_REPULSION_NODES = 2_000
+
+# Node pairs per block of the exact O(n^2) repulsion
+REPULSION_BLOCK = 4_000_000
+
+# Layouts kept in memory by a LayoutService
+DEFAULT_LAYOUT_CACHE = 64
+
+def graph_fingerprint(adjacency):
+    """
+    Content hash of a sparse adjacency matrix
+    """
+    csr = sp.csr_matrix(adjacency)
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(np.asarray(csr.shape, dtype=np.int64).tobytes())
+    for array in (csr.indptr, csr.indices, csr.data):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+def layout_key(fingerprint, algorithm, params):
+    """
+    Cache key for a layout: graph fingerprint, algorithm and sorted params
+    """
+    return (fingerprint, algorithm, tuple(sorted(params.items())))
+
+def _exact_repulsion(pos, mass, kr):
+    # F_i = kr * m_i * sum_j m_j (x_i - x_j) / d_ij^2, in row blocks
+    n = len(pos)
+    force = np.zeros_like(pos)
+    block = max(1, REPULSION_BLOCK // max(n, 1))
+    for start in range(0, n, block):
+        delta = pos[start:start + block, None, :] - pos[None, :, :]
+        dist2 = (delta ** 2).sum(axis=2)
+        np.maximum(dist2, 1e-9, out=dist2)
+        factor = mass[None, :] / dist2
+        factor[np.arange(len(factor)), np.arange(start, start + len(factor))] = 0.0
+        force[start:start + block] = (delta * factor[:, :, None]).sum(axis=1)
+    return kr * mass[:, None] * force
+
+def _grid_repulsion(pos, mass, kr, levels):
+    # Barnes-Hut on a fixed quadtree of grids: at each level a node feels
+    # the cells that are children of its parent's neighbours but not its
+    # own neighbours, through their centre of mass; at the finest level
+    # the 3x3 neighbourhood is summed exactly
+    n = len(pos)
+    lo = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - lo).max()), 1e-9) * (1 + 1e-9)
+    unit = (pos - lo) / span
+    force = np.zeros_like(pos)
+
+    for level in range(2, levels + 1):
+        r = 1 << level
+        cell = np.minimum((unit * r).astype(np.int64), r - 1)
+        flat = cell[:, 0] * r + cell[:, 1]
+        cell_mass = np.bincount(flat, weights=mass, minlength=r * r)
+        centre = np.column_stack([np.bincount(flat, weights=mass * pos[:, d], minlength=r * r)
+                                  for d in range(2)])
+        filled = cell_mass > 0
+        centre[filled] /= cell_mass[filled, None]
+
+        parent = cell >> 1
+        for ox in range(6):
+            cx = 2 * parent[:, 0] - 2 + ox
+            for oy in range(6):
+                cy = 2 * parent[:, 1] - 2 + oy
+                valid = ((cx >= 0) & (cx < r) & (cy >= 0) & (cy < r)
+                         & ((np.abs(cx - cell[:, 0]) > 1) | (np.abs(cy - cell[:, 1]) > 1)))
+                idx = np.flatnonzero(valid)
+                target = cx[idx] * r + cy[idx]
+                m = cell_mass[target]
+                delta = pos[idx] - centre[target]
+                dist2 = np.maximum((delta ** 2).sum(axis=1), 1e-9)
+                force[idx] += delta * (m / dist2)[:, None]
+
+    # Exact near field: pairs of nodes in neighbouring finest-level cells
+    r = 1 << levels
+    cell = np.minimum((unit * r).astype(np.int64), r - 1)
+    flat = cell[:, 0] * r + cell[:, 1]
+    order = np.argsort(flat, kind='stable')
+    cell_start = np.searchsorted(flat[order], np.arange(r * r + 1))
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            cx, cy = cell[:, 0] + dx, cell[:, 1] + dy
+            inside = np.flatnonzero((cx >= 0) & (cx < r) & (cy >= 0) & (cy < r))
+            target = cx[inside] * r + cy[inside]
+            member_pos, counts = row_positions(cell_start, target)
+            i = np.repeat(inside, counts)
+            j = order[member_pos]
+            keep = i != j
+            i, j = i[keep], j[keep]
+            delta = pos[i] - pos[j]
+            dist2 = np.maximum((delta ** 2).sum(axis=1), 1e-9)
+            contribution = delta * (mass[j] / dist2)[:, None]
+            force[:, 0] += np.bincount(i, weights=contribution[:, 0], minlength=n)
+            force[:, 1] += np.bincount(i, weights=contribution[:, 1], minlength=n)
+
+    return kr * mass[:, None] * force
+
+def forceatlas2_layout(adjacency, iterations=100, scaling=2.0, gravity=1.0, edge_weight_influence=1.0,
+                       tolerance=1.0, seed=42, barnes_hut=None):
+    """
+    ForceAtlas2 layout of an undirected weighted graph as an (n, 2) array.
+
+    Every force is computed for all nodes at once with NumPy: degree-weighted
+    repulsion (exact for small graphs, Barnes-Hut over a grid quadtree
+    for large ones), attraction along edges and gravity towards the
+    centre, with ForceAtlas2's adaptive per-node speeds.
+    """
+    W = sp.csr_matrix(adjacency, dtype=np.float64)
+    W = W + W.T
+    W.setdiag(0)
+    W.eliminate_zeros()
+    n = W.shape[0]
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, size=(n, 2)) * np.sqrt(max(n, 1))
+    if n < 2:
+        return pos
+
+    mass = np.diff(W.indptr) + 1.0
+    upper = sp.triu(W).tocoo()
+    src, dst = upper.row, upper.col
+    weight = upper.data ** edge_weight_influence
+
+    if barnes_hut is None:
+        barnes_hut = n > EXACT_REPULSION_NODES
+    # About four nodes per finest-level cell
+    levels = max(2, int(np.ceil(np.log2(np.sqrt(n / 4)))))
+
+    previous = np.zeros_like(pos)
+    speed, speed_efficiency = 1.0, 1.0
+    for _ in range(iterations):
+        if barnes_hut:
+            force = _grid_repulsion(pos, mass, scaling, levels)
+        else:
+            force = _exact_repulsion(pos, mass, scaling)
+
+        # Linear attraction along edges
+        pull = (pos[dst] - pos[src]) * weight[:, None]
+        for d in range(2):
+            force[:, d] += np.bincount(src, weights=pull[:, d], minlength=n)
+            force[:, d] -= np.bincount(dst, weights=pull[:, d], minlength=n)
+
+        # Gravity keeps disconnected pieces from drifting away
+        dist = np.maximum(np.sqrt((pos ** 2).sum(axis=1)), 1e-9)
+        force -= pos * (gravity * mass / dist)[:, None]
+
+        # Adaptive speeds (ForceAtlas2): nodes that oscillate slow down,
+        # nodes moving consistently speed up
+        swing = mass * np.sqrt(((force - previous) ** 2).sum(axis=1))
+        traction = mass * np.sqrt(((force + previous) ** 2).sum(axis=1)) / 2
+        total_swing = max(swing.sum(), 1e-9)
+        total_traction = max(traction.sum(), 1e-9)
+
+        optimal_jitter = 0.05 * np.sqrt(n)
+        jitter = tolerance * max(np.sqrt(optimal_jitter),
+                                 min(10.0, optimal_jitter * total_traction / n ** 2))
+        if total_swing / total_traction > 2.0:
+            speed_efficiency = max(speed_efficiency * 0.5, 0.05)
+            jitter = max(jitter, tolerance)
+        target_speed = jitter * speed_efficiency * total_traction / total_swing
+        if total_swing > jitter * total_traction:
+            speed_efficiency = max(speed_efficiency * 0.7, 0.05)
+        elif speed < 1000:
+            speed_efficiency *= 1.3
+        speed += min(target_speed - speed, 0.5 * speed)
+
+        pos += force * (speed / (1.0 + np.sqrt(speed * swing)))[:, None]
+        previous = force
+
+    return pos
+
+def circular_layout(n):
+    """
+    Nodes evenly spaced on the unit circle
+    """
+    angle = 2 * np.pi * np.arange(n) / max(n, 1)
+    return np.column_stack([np.cos(angle), np.sin(angle)])
+
+def random_layout(n, seed=42):
+    """
+    Nodes placed uniformly at random in the unit square
+    """
+    return np.random.default_rng(seed).random((n, 2))
+
+def compute_layout(adjacency, algorithm='forceatlas2', seed=42, **params):
+    """
+    Node coordinates of a graph as an (n, 2) array, rescaled to [-1, 1]
+    """
+    n = adjacency.shape[0]
+    if algorithm == 'forceatlas2':
+        pos = forceatlas2_layout(adjacency, seed=seed, **params)
+    elif algorithm == 'circular':
+        pos = circular_layout(n)
+    elif algorithm == 'random':
+        pos = random_layout(n, seed=seed)
+    else:
+        raise ValueError(f"Unknown layout algorithm: {algorithm}")
+
+    if n:
+        pos = pos - pos.mean(axis=0)
+        pos /= max(np.abs(pos).max(), 1e-9)
+    return pos
+
+def _layout_worker(args):
+    adjacency, algorithm, params = args
+    return compute_layout(adjacency, algorithm, **params)
+
+class LayoutService:
+    """
+    Computes layouts in a background process pool and caches the results.
+
+    Layouts are keyed by (graph fingerprint, algorithm, params), so
+    drawing options such as node size or edge transparency never trigger
+    a re-layout. `submit` returns a Future straight away; requests for a
+    key that is already computed or running share the same Future. Safe
+    to share between Streamlit sessions, which run in separate threads.
+    """
+
+    def __init__(self, n_jobs=None, max_entries=DEFAULT_LAYOUT_CACHE):
+        if n_jobs is None:
+            n_jobs = min(4, os.cpu_count() or 1)
+        self.pool = ProcessPoolExecutor(max_workers=n_jobs)
+        self.max_entries = max_entries
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, adjacency, algorithm='forceatlas2', **params):
+        key = layout_key(graph_fingerprint(adjacency), algorithm, params)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.cancelled() or (future.done() and future.exception() is not None):
+                future = self.pool.submit(_layout_worker, (adjacency, algorithm, params))
+                self._futures[key] = future
+            self._futures.move_to_end(key)
+
+            # Least recently requested layouts are dropped first
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+        return future
+
+    def layout(self, adjacency, algorithm='forceatlas2', timeout=None, **params):
+        """
+        Coordinates of the graph, waiting for the background job if needed
+        """
+        return self.submit(adjacency, algorithm, **params).result(timeout)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,25 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def worker_count(n_jobs, n_tasks):
+    """
+    Processes to use for n_tasks tasks: `n_jobs` (None means one per
+    CPU), but never more than there are tasks
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, n_tasks))
+
+def parallel_map(worker, tasks, n_jobs=None):
+    """
+    `worker(task)` for every task, in order, computed in a process pool.
+
+    With a single worker the tasks run in this process instead, so
+    `n_jobs=1` never pays for starting a pool.
+    """
+    tasks = list(tasks)
+    n_jobs = worker_count(n_jobs, len(tasks))
+    if n_jobs == 1:
+        return [worker(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(worker, tasks))
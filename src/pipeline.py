@@ -0,0 +1,215 @@
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.data_loader import ANALYSIS_COLUMNS, default_data_path, file_fingerprint, load_twitter_data
+from src.artifact_store import save_bundle
+from src.graph_store import default_graph_path, save_graph
+from src.graph_builder import build_mention_graph, compute_network_metrics
+from src.components import component_analysis
+from src.bridges import detect_bridges
+from src.influence import influence_table
+from src.centrality import compute_centralities
+from src.cascade import STRATEGY_ACCOUNTS, simulate_cascade, strategy_seeds
+from src.seed_selection import compare_strategies
+from src.communities import compute_communities
+from src.polarization import polarization_metrics
+from src.temporal import polarization_over_time
+from src.hashtags import build_hashtag_graph, classify_hashtags
+from src.engagement import engagement_stats
+from src.rollups import build_engagement_cube
+
+# Default settings of the Rumor Spread view, precomputed in the bundle
+DEFAULT_CASCADE_PROBABILITY = 0.12
+DEFAULT_CASCADE_ITERATIONS = 10
+
+def _graph(df, n_jobs):
+    return build_mention_graph(df)
+
+def _network_metrics(graph, n_jobs):
+    return compute_network_metrics(graph)
+
+def _components(graph, n_jobs):
+    return component_analysis(graph)
+
+def _centralities(graph, n_jobs):
+    return compute_centralities(graph, n_jobs=n_jobs)
+
+def _communities(graph, n_jobs):
+    return compute_communities(graph, n_jobs=n_jobs)
+
+def _polarization(graph, communities, n_jobs):
+    return polarization_metrics(graph, communities['labels'])
+
+def _bridges(graph, communities, n_jobs):
+    return detect_bridges(graph, communities['labels'], n_jobs=n_jobs)
+
+def _influence(df, graph, centralities, bridges, n_jobs):
+    return influence_table(graph, centralities, bridges, df)
+
+def _cascades(graph, n_jobs):
+    strategies = list(STRATEGY_ACCOUNTS) + ["Multiple Seeds"]
+    return {
+        'probability': DEFAULT_CASCADE_PROBABILITY,
+        'max_iterations': DEFAULT_CASCADE_ITERATIONS,
+        'results': {name: simulate_cascade(graph, strategy_seeds(graph, name), DEFAULT_CASCADE_PROBABILITY,
+                                           DEFAULT_CASCADE_ITERATIONS, n_jobs=n_jobs)
+                    for name in strategies},
+    }
+
+def _strategy_comparison(graph, n_jobs):
+    return {
+        'probability': DEFAULT_CASCADE_PROBABILITY,
+        'max_iterations': DEFAULT_CASCADE_ITERATIONS,
+        'results': compare_strategies(graph, DEFAULT_CASCADE_PROBABILITY, DEFAULT_CASCADE_ITERATIONS,
+                                      n_jobs=n_jobs),
+    }
+
+def _polarization_over_time(df, n_jobs):
+    return polarization_over_time(df)
+
+def _hashtags(df, n_jobs):
+    return build_hashtag_graph(df)
+
+def _hashtag_categories(hashtags, n_jobs):
+    return classify_hashtags(hashtags)
+
+def _engagement(df, n_jobs):
+    return engagement_stats([df])
+
+def _engagement_cube(df, graph, communities, hashtags, hashtag_categories, engagement, n_jobs):
+    return build_engagement_cube([df], graph, communities['labels'], hashtags,
+                                 hashtag_categories['labels'], engagement['viral_threshold'])
+
+# Every stage: the function computing its artifact and the artifacts it
+# needs ('df' is the tweets DataFrame); stages only wait for their inputs
+STAGES = {
+    'graph': (_graph, ('df',)),
+    'network_metrics': (_network_metrics, ('graph',)),
+    'components': (_components, ('graph',)),
+    'centralities': (_centralities, ('graph',)),
+    'communities': (_communities, ('graph',)),
+    'polarization': (_polarization, ('graph', 'communities')),
+    'bridges': (_bridges, ('graph', 'communities')),
+    'influence': (_influence, ('df', 'graph', 'centralities', 'bridges')),
+    'cascades': (_cascades, ('graph',)),
+    'strategy_comparison': (_strategy_comparison, ('graph',)),
+    'polarization_over_time': (_polarization_over_time, ('df',)),
+    'hashtags': (_hashtags, ('df',)),
+    'hashtag_categories': (_hashtag_categories, ('hashtags',)),
+    'engagement': (_engagement, ('df',)),
+    'engagement_cube': (_engagement_cube,
+                        ('df', 'graph', 'communities', 'hashtags', 'hashtag_categories', 'engagement')),
+}
+
+def required_stages(names):
+    """
+    The given stages and every stage they depend on, in pipeline order
+    """
+    needed = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in STAGES:
+            raise ValueError(f"Unknown analysis stage: {name}")
+        if name not in needed:
+            needed.add(name)
+            pending.extend(dep for dep in STAGES[name][1] if dep != 'df')
+    return [name for name in STAGES if name in needed]
+
+def _run_stage(name, inputs, n_jobs):
+    func, _ = STAGES[name]
+    start = time.perf_counter()
+    artifact = func(*inputs, n_jobs=n_jobs)
+    return artifact, time.perf_counter() - start
+
+def run_pipeline(df, stages=None, n_jobs=None, log=print):
+    """
+    Run analysis stages on a tweets DataFrame and collect their artifacts.
+
+    With more than one job, independent stages run side by side in a
+    process pool (each stage then uses a single process itself); with
+    one job they run in order and each stage may use every CPU.
+
+    Returns (artifacts, timings): artifact per stage name and the
+    seconds each stage took.
+    """
+    stages = required_stages(stages if stages is not None else STAGES)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    results = {'df': df}
+    timings = {}
+
+    def finish(name, artifact, seconds):
+        results[name] = artifact
+        timings[name] = seconds
+        log(f"  ✅ {name:<24} {seconds:8.2f}s")
+
+    if n_jobs == 1:
+        for name in stages:
+            inputs = [results[dep] for dep in STAGES[name][1]]
+            finish(name, *_run_stage(name, inputs, None))
+    else:
+        pending = list(stages)
+        running = {}
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            while pending or running:
+                # Start every stage whose inputs are ready
+                for name in [s for s in pending if all(dep in results for dep in STAGES[s][1])]:
+                    inputs = [results[dep] for dep in STAGES[name][1]]
+                    running[pool.submit(_run_stage, name, inputs, 1)] = name
+                    pending.remove(name)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), *future.result())
+
+    del results['df']
+    return results, timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Precompute the dashboard's analysis bundle from a tweet file")
+    parser.add_argument('file', nargs='?', default=None,
+                        help="tweet CSV (default: the dashboard's dataset)")
+    parser.add_argument('--artifact-dir', default=None,
+                        help="where to write the bundle (default: data/artifacts)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="stages run in parallel (default: one per CPU; 1 runs them in order)")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None,
+                        help="only these stages and their dependencies")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse the CSV even if a columnar cache exists")
+    args = parser.parse_args(argv)
+
+    print("=" * 50)
+    print("BUILDING ANALYSIS BUNDLE")
+    print("=" * 50)
+
+    file_path = args.file or default_data_path()
+    start = time.perf_counter()
+    df = load_twitter_data(file_path, use_cache=not args.no_cache, columns=ANALYSIS_COLUMNS)
+    if df is None:
+        return 1
+    print(f"  ✅ {'load':<24} {time.perf_counter() - start:8.2f}s")
+
+    artifacts, timings = run_pipeline(df, args.stages, args.jobs)
+    artifacts['stage_timings'] = timings
+    fingerprint = file_fingerprint(file_path)
+
+    # The graph is stored in its own memory-mappable file, not the bundle
+    graph = artifacts.pop('graph', None)
+    if graph is not None:
+        graph_path = save_graph(graph, default_graph_path(fingerprint, args.artifact_dir))
+    path = save_bundle(artifacts, fingerprint, args.artifact_dir, source=file_path)
+
+    print(f"\nTotal time: {time.perf_counter() - start:.2f}s")
+    if graph is not None:
+        print(f"✅ Saved mention graph to: {graph_path}")
+    print(f"✅ Saved analysis bundle to: {path}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
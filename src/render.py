@@ -0,0 +1,112 @@
+import numpy as np
+import scipy.sparse as sp
+from matplotlib.collections import LineCollection
+
+# Above this many nodes graphs are drawn as community super-nodes
+MAX_DRAWN_NODES = 2_000
+
+# Edges drawn per figure; heavier edges are more likely to be kept
+MAX_DRAWN_EDGES = 5_000
+
+def undirected_edges(adjacency):
+    """
+    (src, dst, weight) of every undirected edge of A + A^T, without self-loops
+    """
+    W = sp.csr_matrix(adjacency)
+    upper = sp.triu(W + W.T, k=1).tocoo()
+    return upper.row, upper.col, upper.data
+
+def sample_edges(src, dst, weight, max_edges=MAX_DRAWN_EDGES, seed=42):
+    """
+    At most `max_edges` edges, sampled without replacement in proportion
+    to their weight (Efraimidis-Spirakis keys), heaviest keys first
+    """
+    if len(src) <= max_edges:
+        return src, dst, weight
+    rng = np.random.default_rng(seed)
+    keys = np.log(rng.random(len(weight))) / np.maximum(weight, 1e-12)
+    keep = np.argpartition(-keys, max_edges - 1)[:max_edges]
+    return src[keep], dst[keep], weight[keep]
+
+def community_supergraph(adjacency, labels, pos=None):
+    """
+    Collapse every community into one super-node.
+
+    Returns (super_adjacency, sizes, centres): mention weight between
+    communities (L^T A L for the membership indicator L), members per
+    community, and the members' mean position when `pos` is given.
+    """
+    labels = np.asarray(labels)
+    n_communities = int(labels.max()) + 1 if len(labels) else 0
+    membership = sp.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)),
+                               shape=(len(labels), n_communities))
+    super_adjacency = (membership.T @ sp.csr_matrix(adjacency) @ membership).tocsr()
+    super_adjacency.setdiag(0)
+    super_adjacency.eliminate_zeros()
+
+    sizes = np.bincount(labels, minlength=n_communities)
+    centres = None
+    if pos is not None:
+        centres = np.column_stack([np.bincount(labels, weights=pos[:, d], minlength=n_communities)
+                                   for d in range(2)]) / np.maximum(sizes, 1)[:, None]
+    return super_adjacency, sizes, centres
+
+def draw_nodes(ax, pos, sizes=50, colors='lightblue', cmap=None, alpha=0.8, zorder=2, **kwargs):
+    """
+    Every node in one scatter call (a single PathCollection)
+    """
+    return ax.scatter(pos[:, 0], pos[:, 1], s=sizes, c=colors, cmap=cmap, alpha=alpha,
+                      linewidths=0, zorder=zorder, **kwargs)
+
+def draw_edges(ax, pos, src, dst, widths=0.5, colors='gray', alpha=0.3, zorder=1):
+    """
+    Every edge in one LineCollection
+    """
+    segments = np.stack([pos[src], pos[dst]], axis=1)
+    lines = LineCollection(segments, linewidths=widths, colors=colors, alpha=alpha, zorder=zorder)
+    ax.add_collection(lines)
+    return lines
+
+def draw_graph(ax, adjacency, pos, node_size=50, node_color='lightblue', cmap=None, node_alpha=0.8,
+               edge_color='gray', edge_alpha=0.3, edge_width=0.5, labels=None, font_size=8,
+               max_edges=MAX_DRAWN_EDGES, seed=42):
+    """
+    Draw a graph with one scatter for the nodes and one LineCollection for
+    at most `max_edges` weight-sampled edges, so the number of matplotlib
+    artists does not grow with the graph. `labels` names each node.
+
+    Returns (edges_drawn, edges_total).
+    """
+    src, dst, weight = undirected_edges(adjacency)
+    total = len(src)
+    src, dst, weight = sample_edges(src, dst, weight, max_edges, seed)
+
+    draw_edges(ax, pos, src, dst, edge_width, edge_color, edge_alpha)
+    draw_nodes(ax, pos, node_size, node_color, cmap, node_alpha)
+    if labels is not None:
+        for (x, y), label in zip(pos, labels):
+            ax.text(x, y, label, ha='center', va='center', fontsize=font_size, fontweight='bold')
+
+    ax.autoscale_view()
+    return len(src), total
+
+def draw_communities(ax, super_adjacency, sizes, pos, colors=None, cmap='tab20', node_size=50,
+                     edge_alpha=0.3, max_edges=MAX_DRAWN_EDGES, seed=42):
+    """
+    Low-detail view: one node per community, area proportional to its
+    members, and edges as thick as the mentions between communities.
+
+    Returns (edges_drawn, edges_total).
+    """
+    src, dst, weight = undirected_edges(super_adjacency)
+    total = len(src)
+    src, dst, weight = sample_edges(src, dst, weight, max_edges, seed)
+
+    if colors is None:
+        colors = np.arange(len(sizes))
+    widths = 0.5 + 4.5 * weight / weight.max() if len(weight) else 0.5
+    draw_edges(ax, pos, src, dst, widths, 'gray', edge_alpha)
+    draw_nodes(ax, pos, node_size * (1 + 20 * np.sqrt(sizes / max(sizes.max(), 1))), colors, cmap)
+
+    ax.autoscale_view()
+    return len(src), total
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from src.graph_builder import normalize_handles
+from src.hashtags import HASHTAG_PATTERN
+
+# Dimensions of the engagement cube, in index order
+CUBE_DIMENSIONS = ['day', 'hour', 'community', 'category']
+
+# Additive measures stored in every cube cell
+CUBE_MEASURES = ['tweets', 'likes', 'retweets', 'engagement', 'viral']
+
+# Hours are reported in US Eastern time; naive timestamps are taken as UTC
+CUBE_TIMEZONE = 'US/Eastern'
+
+# Category of tweets without a classified hashtag
+NO_CATEGORY = 'None'
+
+class EngagementCube:
+    """
+    Pre-aggregated engagement sums by day x hour x community x hashtag category.
+
+    Chunks are rolled up as they are ingested, so the cube only holds one
+    row per non-empty cell. Timing charts are answered with `rollup`,
+    which scans cells instead of tweets.
+    """
+
+    def __init__(self, user_communities=None, tag_categories=None, viral_threshold=None):
+        # Lookups from lower-case handle / tag to community / category
+        self.user_communities = user_communities
+        self.tag_categories = tag_categories
+        self.viral_threshold = viral_threshold
+        self.cells = pd.DataFrame(columns=CUBE_MEASURES, dtype=np.float64,
+                                  index=pd.MultiIndex.from_arrays([[]] * 4, names=CUBE_DIMENSIONS))
+
+    def update(self, chunk, text_col='text', user_col='user', time_col='created_at'):
+        timestamps = pd.to_datetime(chunk[time_col], errors='coerce')
+        if timestamps.dt.tz is None:
+            timestamps = timestamps.dt.tz_localize('UTC')
+        local = timestamps.dt.tz_convert(CUBE_TIMEZONE)
+
+        likes = pd.to_numeric(chunk.get('likes', 0), errors='coerce')
+        retweets = pd.to_numeric(chunk.get('retweets', 0), errors='coerce')
+        measures = pd.DataFrame({
+            'tweets': 1.0,
+            'likes': likes,
+            'retweets': retweets,
+        }, index=chunk.index).fillna(0.0)
+        measures['engagement'] = measures['likes'] + measures['retweets']
+        measures['viral'] = 0.0
+        if self.viral_threshold is not None:
+            measures['viral'] = (measures['engagement'] >= self.viral_threshold).astype(np.float64)
+
+        keys = [
+            local.dt.tz_localize(None).dt.normalize().rename('day'),
+            local.dt.hour.rename('hour'),
+            self._communities(chunk[user_col]).rename('community'),
+            self._categories(chunk[text_col]).rename('category'),
+        ]
+        partial = measures[timestamps.notna()].groupby([k[timestamps.notna()] for k in keys],
+                                                       observed=True).sum()
+        self.cells = partial if self.cells.empty else self.cells.add(partial, fill_value=0.0)
+        return self
+
+    def _communities(self, users):
+        if self.user_communities is None:
+            return pd.Series(-1, index=users.index)
+        handles = normalize_handles(users)
+        return handles.map(self.user_communities).fillna(-1).astype(np.int64)
+
+    def _categories(self, text):
+        if self.tag_categories is None:
+            return pd.Series(NO_CATEGORY, index=text.index)
+
+        # A tweet's category is that of its first classified hashtag
+        tags = text.fillna('').astype(str).str.findall(HASHTAG_PATTERN).explode().dropna().str.lower()
+        categories = tags.map(self.tag_categories).dropna()
+        first = categories[~categories.index.duplicated()]
+        return first.reindex(text.index).fillna(NO_CATEGORY)
+
+    def rollup(self, by):
+        """
+        Measures summed over every dimension not in `by`, plus the average
+        engagement and viral rate of each group
+        """
+        grouped = self.cells.groupby(level=by).sum()
+        tweets = grouped['tweets'].where(grouped['tweets'] > 0)
+        grouped['average_engagement'] = (grouped['engagement'] / tweets).fillna(0.0)
+        grouped['viral_rate'] = (grouped['viral'] / tweets).fillna(0.0)
+        return grouped
+
+def build_engagement_cube(chunks, graph=None, labels=None, hashtag_graph=None, tag_labels=None,
+                          viral_threshold=None):
+    """
+    Roll an iterable of tweet DataFrames up into an EngagementCube.
+
+    Communities come from the mention graph's partition (`graph`, `labels`)
+    and hashtag categories from `classify_hashtags` labels of
+    `hashtag_graph`; without them those dimensions hold a single value.
+    """
+    user_communities = None
+    if graph is not None and labels is not None:
+        user_communities = pd.Series(np.asarray(labels), index=graph.handles)
+
+    tag_categories = None
+    if hashtag_graph is not None and tag_labels is not None:
+        tag_categories = pd.Series(tag_labels, index=hashtag_graph.tags)
+        tag_categories = tag_categories[tag_categories != 'Unclassified']
+
+    cube = EngagementCube(user_communities, tag_categories, viral_threshold)
+    for chunk in chunks:
+        cube.update(chunk)
+    return cube
+
+def peak_hours(cube, k=3):
+    """
+    The k hours of the day with the highest average engagement, in clock order
+    """
+    by_hour = cube.rollup('hour')
+    return sorted(by_hour['average_engagement'].nlargest(k).index.astype(int).tolist())
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.communities import detect_communities
+from src.graph_builder import MentionGraph, extract_interactions
+from src.polarization import polarization_metrics
+
+# Default bucket size and number of buckets in each sliding window
+DEFAULT_FREQ = 'D'
+DEFAULT_WINDOW = 3
+
+def bucket_interactions(df, freq=DEFAULT_FREQ, text_col='text', user_col='user', time_col='created_at'):
+    """
+    Mention interactions grouped into consecutive time buckets.
+
+    Returns (periods, users, edges, counts, bucket_indptr): the bucket
+    start times (empty buckets included), the interned user handles, the
+    (src, dst) user IDs of every distinct mention pair, and a DataFrame of
+    (edge, count) rows where bucket b owns rows
+    `bucket_indptr[b]:bucket_indptr[b + 1]`.
+    """
+    interactions = extract_interactions(df, text_col, user_col, time_col)
+    timestamps = pd.to_datetime(interactions['timestamp'], errors='coerce')
+    interactions = interactions[timestamps.notna()]
+    timestamps = timestamps[timestamps.notna()].dt.floor(freq)
+
+    if timestamps.empty:
+        periods = pd.DatetimeIndex([])
+    else:
+        periods = pd.date_range(timestamps.min(), timestamps.max(), freq=freq)
+    bucket = periods.searchsorted(timestamps.to_numpy())
+
+    n_rows = len(interactions)
+    codes, users = pd.factorize(np.concatenate([interactions['source'].to_numpy(),
+                                                interactions['target'].to_numpy()]))
+    n = len(users)
+    pair = codes[:n_rows].astype(np.int64) * n + codes[n_rows:]
+    edge_id, pairs = pd.factorize(pair)
+    edges = np.column_stack(np.divmod(pairs.astype(np.int64), max(n, 1)))
+
+    # One (bucket, edge) row per distinct pair mentioned in a bucket,
+    # sorted by bucket so each bucket is a contiguous slice
+    n_edges = len(pairs)
+    key, mentions = np.unique(bucket.astype(np.int64) * n_edges + edge_id, return_counts=True)
+    key_bucket, key_edge = np.divmod(key, max(n_edges, 1))
+    counts = pd.DataFrame({'edge': key_edge, 'count': mentions.astype(np.float32)})
+    bucket_indptr = np.concatenate(([0], np.bincount(key_bucket, minlength=len(periods)).cumsum()))
+    return periods, np.asarray(users, dtype=object), edges, counts, bucket_indptr
+
+def polarization_over_time(df, freq=DEFAULT_FREQ, window=DEFAULT_WINDOW, method='louvain',
+                           resolution=1.0, seed=42, text_col='text', user_col='user',
+                           time_col='created_at'):
+    """
+    Polarization metrics of the mention graph in a sliding time window.
+
+    Tweets are bucketed by `freq` and each window covers `window`
+    consecutive buckets. The window's edge weights are updated
+    incrementally (the newest bucket is added and the expired one
+    subtracted), and each window's community detection is warm-started
+    from the previous window's partition, so a full series costs about
+    one pass over the mentions.
+
+    Returns a DataFrame with one row per window: its start and end (the
+    end is exclusive), the active users, edges and mentions, the number of
+    communities and the `polarization_metrics` of the window's partition.
+    """
+    periods, users, edges, counts, bucket_indptr = bucket_interactions(df, freq, text_col, user_col,
+                                                                       time_col)
+    edge_ids = counts['edge'].to_numpy()
+    edge_counts = counts['count'].to_numpy()
+    weight = np.zeros(len(edges), dtype=np.float32)
+    previous = np.full(len(users), -1, dtype=np.int64)
+    offset = pd.tseries.frequencies.to_offset(freq)
+
+    rows = []
+    for b in range(len(periods)):
+        # Slide the window: add bucket b, retire bucket b - window
+        added = slice(bucket_indptr[b], bucket_indptr[b + 1])
+        weight[edge_ids[added]] += edge_counts[added]
+        if b >= window:
+            expired = slice(bucket_indptr[b - window], bucket_indptr[b - window + 1])
+            weight[edge_ids[expired]] -= edge_counts[expired]
+        if b < window - 1 and b < len(periods) - 1:
+            continue
+
+        first = max(0, b - window + 1)
+        active = np.unique(edge_ids[bucket_indptr[first]:bucket_indptr[b + 1]])
+        row = {'window_start': periods[first], 'window_end': periods[b] + offset}
+
+        # Compact the window's users to local IDs
+        nodes, local = np.unique(edges[active], return_inverse=True)
+        local = local.reshape(-1, 2)
+        n_local = len(nodes)
+        adjacency = sp.csr_matrix((weight[active], (local[:, 0], local[:, 1])), shape=(n_local, n_local))
+        graph = MentionGraph(adjacency, users[nodes])
+
+        if n_local:
+            # Users seen in the previous window keep their community,
+            # new users start out on their own
+            initial = previous[nodes].copy()
+            fresh = initial < 0
+            initial[fresh] = initial.max(initial=-1) + 1 + np.arange(fresh.sum())
+            labels = detect_communities(graph, method, resolution, seed, initial=initial)
+        else:
+            labels = np.empty(0, dtype=np.int32)
+        previous[:] = -1
+        previous[nodes] = labels
+
+        row.update({
+            'users': n_local,
+            'edges': graph.n_edges,
+            'mentions': float(adjacency.sum()),
+            'communities': int(labels.max()) + 1 if n_local else 0,
+        })
+        row.update(polarization_metrics(graph, labels))
+        rows.append(row)
+
+    return pd.DataFrame(rows)